@@ -0,0 +1,55 @@
+"""
+Add PostGIS geography column to resources
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+def upgrade():
+    """Add geography column, sync trigger and GiST index (PostgreSQL only)"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS postgis')
+    op.execute('ALTER TABLE resources ADD COLUMN location geography(Point, 4326)')
+
+    # Backfill from existing coordinates
+    op.execute("""
+        UPDATE resources
+        SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    """)
+
+    # Keep location in sync with latitude/longitude written by the ORM
+    op.execute("""
+        CREATE OR REPLACE FUNCTION resources_sync_location() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.latitude IS NULL OR NEW.longitude IS NULL THEN
+                NEW.location := NULL;
+            ELSE
+                NEW.location := ST_SetSRID(ST_MakePoint(NEW.longitude, NEW.latitude), 4326)::geography;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_resources_sync_location
+        BEFORE INSERT OR UPDATE OF latitude, longitude ON resources
+        FOR EACH ROW EXECUTE FUNCTION resources_sync_location()
+    """)
+
+    op.execute('CREATE INDEX idx_resource_geography ON resources USING GIST (location)')
+
+def downgrade():
+    """Drop geography column, sync trigger and GiST index"""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP INDEX IF EXISTS idx_resource_geography')
+    op.execute('DROP TRIGGER IF EXISTS trg_resources_sync_location ON resources')
+    op.execute('DROP FUNCTION IF EXISTS resources_sync_location()')
+    op.execute('ALTER TABLE resources DROP COLUMN IF EXISTS location')
@@ -0,0 +1,23 @@
+"""
+Add keyset pagination indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+def upgrade():
+    """Create (sort_key, id) indexes for cursor pagination"""
+    op.create_index('idx_resource_start_id', 'resources', ['start_date', 'id'])
+    op.create_index('idx_resource_provider_start_id', 'resources', ['service_provider_id', 'start_date', 'id'])
+    op.create_index('idx_allocation_start_id', 'resource_allocations', ['allocated_start_date', 'id'])
+    op.create_index('idx_allocation_trade_start_id', 'resource_allocations', ['trade_id', 'allocated_start_date', 'id'])
+
+def downgrade():
+    """Drop cursor pagination indexes"""
+    op.drop_index('idx_allocation_trade_start_id', table_name='resource_allocations')
+    op.drop_index('idx_allocation_start_id', table_name='resource_allocations')
+    op.drop_index('idx_resource_provider_start_id', table_name='resources')
+    op.drop_index('idx_resource_start_id', table_name='resources')
@@ -0,0 +1,234 @@
+"""
+Replace per-day calendar rows with calendar intervals
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+"""
+
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+STATUS_PRECEDENCE = {'available': 0, 'tentative': 1, 'allocated': 2}
+
+calendar_intervals = sa.table(
+    'resource_calendar_intervals',
+    sa.column('resource_id', sa.Integer()),
+    sa.column('allocation_id', sa.Integer()),
+    sa.column('service_provider_id', sa.Integer()),
+    sa.column('start_date', sa.Date()),
+    sa.column('end_date', sa.Date()),
+    sa.column('person_count', sa.Integer()),
+    sa.column('hours_allocated', sa.Float()),
+    sa.column('status', sa.String(50)),
+    sa.column('color', sa.String(7)),
+    sa.column('label', sa.String(255)),
+    sa.column('created_at', sa.DateTime()),
+    sa.column('updated_at', sa.DateTime()),
+)
+
+calendar_entries = sa.table(
+    'resource_calendar_entries',
+    sa.column('resource_id', sa.Integer()),
+    sa.column('allocation_id', sa.Integer()),
+    sa.column('service_provider_id', sa.Integer()),
+    sa.column('entry_date', sa.Date()),
+    sa.column('person_count', sa.Integer()),
+    sa.column('hours_allocated', sa.Float()),
+    sa.column('status', sa.String(50)),
+    sa.column('color', sa.String(7)),
+    sa.column('label', sa.String(255)),
+    sa.column('created_at', sa.DateTime()),
+    sa.column('updated_at', sa.DateTime()),
+)
+
+resource_allocations = sa.table(
+    'resource_allocations',
+    sa.column('id', sa.Integer()),
+    sa.column('resource_id', sa.Integer()),
+    sa.column('allocated_start_date', sa.Date()),
+    sa.column('allocated_end_date', sa.Date()),
+    sa.column('allocation_status', sa.String(50)),
+)
+
+def upgrade():
+    """Create calendar intervals table and collapse daily entries into it"""
+    op.create_table(
+        'resource_calendar_intervals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resource_id', sa.Integer(), nullable=False),
+        sa.Column('allocation_id', sa.Integer(), nullable=True),
+        sa.Column('service_provider_id', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('person_count', sa.Integer(), nullable=False),
+        sa.Column('hours_allocated', sa.Float(), nullable=True),
+        sa.Column('status', sa.String(50), nullable=True),
+        sa.Column('color', sa.String(7), nullable=True),
+        sa.Column('label', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['allocation_id'], ['resource_allocations.id'], ),
+        sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+        sa.ForeignKeyConstraint(['service_provider_id'], ['service_providers_extended.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('end_date >= start_date', name='check_calendar_interval_dates')
+    )
+
+    # Create indexes for calendar intervals
+    op.create_index('idx_calendar_interval_provider_dates', 'resource_calendar_intervals',
+                    ['service_provider_id', 'start_date', 'end_date'])
+    op.create_index('idx_calendar_interval_resource', 'resource_calendar_intervals', ['resource_id'])
+    op.create_index('idx_calendar_interval_allocation', 'resource_calendar_intervals', ['allocation_id'])
+
+    # Base interval per resource
+    op.execute("""
+        INSERT INTO resource_calendar_intervals (
+            resource_id, service_provider_id, start_date, end_date, person_count,
+            hours_allocated, status, color, label, created_at, updated_at
+        )
+        SELECT id, service_provider_id, start_date, end_date, person_count,
+               daily_hours, 'available', '#4CAF50',
+               category || ' - ' || person_count || ' Personen',
+               created_at, updated_at
+        FROM resources
+    """)
+
+    # Overlay intervals from runs of consecutive non-available days.
+    # Tentative days were written without allocation_id, so they are matched
+    # to an allocation of the resource covering the day (pre_selected first);
+    # days without any are dropped, as intervals without allocation_id are
+    # base intervals.
+    bind = op.get_bind()
+    covering = sa.and_(
+        calendar_entries.c.allocation_id.is_(None),
+        resource_allocations.c.resource_id == calendar_entries.c.resource_id,
+        resource_allocations.c.allocated_start_date <= calendar_entries.c.entry_date,
+        resource_allocations.c.allocated_end_date >= calendar_entries.c.entry_date
+    )
+    rows = bind.execute(
+        sa.select(
+            calendar_entries.c.resource_id,
+            sa.func.coalesce(calendar_entries.c.allocation_id, resource_allocations.c.id).label('allocation_id'),
+            calendar_entries.c.service_provider_id,
+            calendar_entries.c.entry_date,
+            calendar_entries.c.person_count,
+            calendar_entries.c.hours_allocated,
+            calendar_entries.c.status,
+            calendar_entries.c.color,
+        ).select_from(
+            calendar_entries.outerjoin(resource_allocations, covering)
+        ).where(
+            sa.and_(
+                calendar_entries.c.resource_id.isnot(None),
+                calendar_entries.c.status != 'available'
+            )
+        ).order_by(
+            calendar_entries.c.resource_id,
+            calendar_entries.c.entry_date,
+            sa.case((resource_allocations.c.allocation_status == 'pre_selected', 0), else_=1),
+            resource_allocations.c.id
+        )
+    )
+
+    now = datetime.utcnow()
+    overlays = []
+    previous_day = None
+    for row in rows:
+        # Only the preferred allocation of a day counts
+        if (row.resource_id, row.entry_date) == previous_day:
+            continue
+        previous_day = (row.resource_id, row.entry_date)
+        if row.allocation_id is None:
+            continue
+
+        key = (row.resource_id, row.allocation_id, row.status, row.color)
+        current = overlays[-1] if overlays else None
+        if (
+            current is not None
+            and current['_key'] == key
+            and current['end_date'] + timedelta(days=1) == row.entry_date
+        ):
+            current['end_date'] = row.entry_date
+            continue
+        overlays.append({
+            '_key': key,
+            'resource_id': row.resource_id,
+            'allocation_id': row.allocation_id,
+            'service_provider_id': row.service_provider_id,
+            'start_date': row.entry_date,
+            'end_date': row.entry_date,
+            'person_count': row.person_count,
+            'hours_allocated': row.hours_allocated,
+            'status': row.status,
+            'color': row.color,
+            'created_at': now,
+            'updated_at': now,
+        })
+
+    for overlay in overlays:
+        del overlay['_key']
+    if overlays:
+        op.bulk_insert(calendar_intervals, overlays)
+
+    op.execute('DELETE FROM resource_calendar_entries WHERE resource_id IS NOT NULL')
+
+def downgrade():
+    """Expand calendar intervals back into daily entries and drop the intervals table"""
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            calendar_intervals.c.resource_id,
+            calendar_intervals.c.allocation_id,
+            calendar_intervals.c.service_provider_id,
+            calendar_intervals.c.start_date,
+            calendar_intervals.c.end_date,
+            calendar_intervals.c.person_count,
+            calendar_intervals.c.hours_allocated,
+            calendar_intervals.c.status,
+            calendar_intervals.c.color,
+            calendar_intervals.c.label,
+        ).order_by(calendar_intervals.c.resource_id, sa.text('id'))
+    ).fetchall()
+
+    now = datetime.utcnow()
+    entries = {}
+    bases = [row for row in rows if row.allocation_id is None]
+    overlays = sorted(
+        (row for row in rows if row.allocation_id is not None),
+        key=lambda row: STATUS_PRECEDENCE.get(row.status, 0)
+    )
+
+    for base in bases:
+        day = base.start_date
+        while day <= base.end_date:
+            entries[(base.resource_id, day)] = {
+                'resource_id': base.resource_id,
+                'allocation_id': None,
+                'service_provider_id': base.service_provider_id,
+                'entry_date': day,
+                'person_count': base.person_count,
+                'hours_allocated': base.hours_allocated,
+                'status': base.status,
+                'color': base.color,
+                'label': base.label,
+                'created_at': now,
+                'updated_at': now,
+            }
+            day += timedelta(days=1)
+
+    for overlay in overlays:
+        day = overlay.start_date
+        while day <= overlay.end_date:
+            entry = entries.get((overlay.resource_id, day))
+            if entry is not None:
+                entry['allocation_id'] = overlay.allocation_id
+                entry['status'] = overlay.status
+                entry['color'] = overlay.color
+            day += timedelta(days=1)
+
+    if entries:
+        op.bulk_insert(calendar_entries, list(entries.values()))
+
+    op.drop_table('resource_calendar_intervals')
@@ -0,0 +1,126 @@
+"""
+Create incrementally maintained KPI rollup buckets
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from alembic import op
+import sqlalchemy as sa
+
+BOOKED_ALLOCATION_STATUSES = ('accepted', 'confirmed')
+
+kpi_rollups = sa.table(
+    'resource_kpi_rollups',
+    sa.column('service_provider_id', sa.Integer()),
+    sa.column('bucket_date', sa.Date()),
+    sa.column('metric', sa.String(50)),
+    sa.column('start_value', sa.Float()),
+    sa.column('end_value', sa.Float()),
+    sa.column('cumulative_start', sa.Float()),
+    sa.column('cumulative_end', sa.Float()),
+    sa.column('cumulative_days', sa.Float()),
+    sa.column('updated_at', sa.DateTime()),
+)
+
+def upgrade():
+    """Create KPI rollup table and backfill it from resources and allocations"""
+    op.create_table(
+        'resource_kpi_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('service_provider_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_date', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(50), nullable=False),
+        sa.Column('start_value', sa.Float(), nullable=False),
+        sa.Column('end_value', sa.Float(), nullable=False),
+        sa.Column('cumulative_start', sa.Float(), nullable=False),
+        sa.Column('cumulative_end', sa.Float(), nullable=False),
+        sa.Column('cumulative_days', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['service_provider_id'], ['service_providers_extended.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('service_provider_id', 'metric', 'bucket_date', name='unique_provider_metric_bucket')
+    )
+
+    # Each item adds its value at its first day and removes it the day after its last day
+    buckets = defaultdict(lambda: [0.0, 0.0])
+
+    def contribute(provider_id, start_date, end_date, metric, value):
+        if value:
+            buckets[(provider_id, start_date, metric)][0] += float(value)
+            buckets[(provider_id, end_date + timedelta(days=1), metric)][1] += float(value)
+
+    bind = op.get_bind()
+    resources = bind.execute(sa.text(
+        'SELECT service_provider_id, start_date, end_date, person_count, status FROM resources'
+    ))
+    for row in resources:
+        args = (row.service_provider_id, _as_date(row.start_date), _as_date(row.end_date))
+        contribute(*args, 'resources', 1)
+        contribute(*args, 'resources_allocated', 1 if row.status == 'allocated' else 0)
+        contribute(*args, 'resources_completed', 1 if row.status == 'completed' else 0)
+        contribute(*args, 'person_days_available', row.person_count)
+
+    allocations = bind.execute(sa.text("""
+        SELECT r.service_provider_id, a.allocated_start_date, a.allocated_end_date,
+               a.allocated_person_count, a.allocation_status, a.total_cost,
+               a.invitation_sent_at, a.offer_submitted_at
+        FROM resource_allocations a
+        JOIN resources r ON r.id = a.resource_id
+    """))
+    for row in allocations:
+        booked = row.allocation_status in BOOKED_ALLOCATION_STATUSES
+        completed = row.allocation_status == 'completed'
+        cost = row.total_cost or 0
+        args = (row.service_provider_id, _as_date(row.allocated_start_date), _as_date(row.allocated_end_date))
+        contribute(*args, 'person_days_allocated', row.allocated_person_count if booked else 0)
+        contribute(*args, 'person_days_completed', row.allocated_person_count if completed else 0)
+        contribute(*args, 'revenue', cost if completed else 0)
+        contribute(*args, 'potential_revenue', cost if booked else 0)
+        contribute(*args, 'invitations_sent', 1 if row.invitation_sent_at else 0)
+        contribute(*args, 'offers_submitted', 1 if row.offer_submitted_at else 0)
+        contribute(*args, 'offers_accepted', 1 if row.allocation_status == 'accepted' else 0)
+
+    # Running totals per provider and metric in bucket order: start/end
+    # values up to and including each bucket, and the active value summed
+    # over the days before it
+    now = datetime.utcnow()
+    rows = []
+    previous = {}
+    for (provider_id, bucket_date, metric), (start_value, end_value) in sorted(
+        buckets.items(), key=lambda item: (item[0][0], item[0][2], item[0][1])
+    ):
+        cumulative_days = 0.0
+        cumulative_start = cumulative_end = 0.0
+        if (provider_id, metric) in previous:
+            previous_date, cumulative_start, cumulative_end, previous_days = previous[(provider_id, metric)]
+            cumulative_days = previous_days + (cumulative_start - cumulative_end) * (bucket_date - previous_date).days
+        cumulative_start += start_value
+        cumulative_end += end_value
+        previous[(provider_id, metric)] = (bucket_date, cumulative_start, cumulative_end, cumulative_days)
+        rows.append({
+            'service_provider_id': provider_id,
+            'bucket_date': bucket_date,
+            'metric': metric,
+            'start_value': start_value,
+            'end_value': end_value,
+            'cumulative_start': cumulative_start,
+            'cumulative_end': cumulative_end,
+            'cumulative_days': cumulative_days,
+            'updated_at': now,
+        })
+    if rows:
+        op.bulk_insert(kpi_rollups, rows)
+
+def downgrade():
+    """Drop KPI rollup table"""
+    op.drop_table('resource_kpi_rollups')
+
+def _as_date(value):
+    """Normalize dates returned as ISO strings by SQLite"""
+    if isinstance(value, str):
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    return value
@@ -0,0 +1,17 @@
+"""
+Add resource matching prefilter index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+def upgrade():
+    """Create (category, start_date, end_date) index for request matching"""
+    op.create_index('idx_resource_category_dates', 'resources', ['category', 'start_date', 'end_date'])
+
+def downgrade():
+    """Drop request matching index"""
+    op.drop_index('idx_resource_category_dates', table_name='resources')
@@ -0,0 +1,57 @@
+"""
+Normalize resource skills and equipment into resource_tags
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+
+import json
+from alembic import op
+import sqlalchemy as sa
+
+resource_tags = sa.table(
+    'resource_tags',
+    sa.column('resource_id', sa.Integer()),
+    sa.column('kind', sa.String(20)),
+    sa.column('tag', sa.String(100)),
+)
+
+def upgrade():
+    """Create resource tags table and backfill it from the JSON skill/equipment columns"""
+    op.create_table(
+        'resource_tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resource_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('tag', sa.String(100), nullable=False),
+        sa.ForeignKeyConstraint(['resource_id'], ['resources.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resource_id', 'kind', 'tag', name='unique_resource_tag')
+    )
+    op.create_index('idx_resource_tag_lookup', 'resource_tags', ['kind', 'tag', 'resource_id'])
+
+    bind = op.get_bind()
+    rows = []
+    for resource in bind.execute(sa.text('SELECT id, skills, equipment FROM resources')):
+        for kind, value in (('skill', resource.skills), ('equipment', resource.equipment)):
+            for tag in dict.fromkeys(_parse_json_list(value)):
+                rows.append({'resource_id': resource.id, 'kind': kind, 'tag': tag})
+
+    if rows:
+        op.bulk_insert(resource_tags, rows)
+
+def downgrade():
+    """Drop resource tags table"""
+    op.drop_index('idx_resource_tag_lookup', table_name='resource_tags')
+    op.drop_table('resource_tags')
+
+def _parse_json_list(value):
+    """Parse a JSON array column, treating malformed values as empty"""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return []
+    return parsed if isinstance(parsed, list) else []
@@ -97,14 +97,19 @@ class Resource(Base):
     provider = relationship("ServiceProvider", back_populates="resources")
     allocations = relationship("ResourceAllocation", back_populates="resource", cascade="all, delete-orphan")
     calendar_entries = relationship("ResourceCalendarEntry", back_populates="resource", cascade="all, delete-orphan")
+    calendar_intervals = relationship("ResourceCalendarInterval", back_populates="resource", cascade="all, delete-orphan")
+    tags = relationship("ResourceTag", back_populates="resource", cascade="all, delete-orphan")
     
     # Indexes for performance
     __table_args__ = (
         Index('idx_resource_provider', 'service_provider_id'),
         Index('idx_resource_dates', 'start_date', 'end_date'),
         Index('idx_resource_category', 'category'),
+        Index('idx_resource_category_dates', 'category', 'start_date', 'end_date'),
         Index('idx_resource_status', 'status'),
         Index('idx_resource_location', 'latitude', 'longitude'),
+        Index('idx_resource_start_id', 'start_date', 'id'),
+        Index('idx_resource_provider_start_id', 'service_provider_id', 'start_date', 'id'),
         CheckConstraint('end_date >= start_date', name='check_dates'),
         CheckConstraint('person_count > 0', name='check_person_count'),
     )
@@ -195,6 +200,8 @@ class ResourceAllocation(Base):
         Index('idx_allocation_trade', 'trade_id'),
         Index('idx_allocation_status', 'allocation_status'),
         Index('idx_allocation_dates', 'allocated_start_date', 'allocated_end_date'),
+        Index('idx_allocation_start_id', 'allocated_start_date', 'id'),
+        Index('idx_allocation_trade_start_id', 'trade_id', 'allocated_start_date', 'id'),
         CheckConstraint('allocated_end_date >= allocated_start_date', name='check_allocation_dates'),
         CheckConstraint('allocated_person_count > 0', name='check_allocation_persons'),
     )
@@ -288,6 +295,68 @@ class ResourceCalendarEntry(Base):
     )
 
 
+class ResourceCalendarInterval(Base):
+    """Calendar intervals for resource planning - expanded to daily entries on read
+    
+    Each resource has one base interval (allocation_id NULL) spanning its
+    availability; allocations add overlay intervals whose status wins over
+    the base interval on the days they cover.
+    """
+    __tablename__ = 'resource_calendar_intervals'
+    
+    id = Column(Integer, primary_key=True)
+    resource_id = Column(Integer, ForeignKey('resources.id'), nullable=False)
+    allocation_id = Column(Integer, ForeignKey('resource_allocations.id'))
+    service_provider_id = Column(Integer, ForeignKey('service_providers_extended.id'), nullable=False)
+    
+    # Calendar data
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    person_count = Column(Integer, nullable=False)
+    hours_allocated = Column(Float)
+    
+    # Display properties
+    status = Column(String(50), default='available')
+    color = Column(String(7))  # HEX color
+    label = Column(String(255))
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    resource = relationship("Resource", back_populates="calendar_intervals")
+    
+    __table_args__ = (
+        Index('idx_calendar_interval_provider_dates', 'service_provider_id', 'start_date', 'end_date'),
+        Index('idx_calendar_interval_resource', 'resource_id'),
+        Index('idx_calendar_interval_allocation', 'allocation_id'),
+        CheckConstraint('end_date >= start_date', name='check_calendar_interval_dates'),
+    )
+
+
+class ResourceTag(Base):
+    """Normalized skills and equipment of a resource - one row per resource, kind and tag
+    
+    Mirrors the JSON arrays in Resource.skills and Resource.equipment so
+    set queries ("has all skills", "has any equipment") run on an index.
+    """
+    __tablename__ = 'resource_tags'
+    
+    id = Column(Integer, primary_key=True)
+    resource_id = Column(Integer, ForeignKey('resources.id'), nullable=False)
+    kind = Column(String(20), nullable=False)  # skill, equipment
+    tag = Column(String(100), nullable=False)
+    
+    # Relationships
+    resource = relationship("Resource", back_populates="tags")
+    
+    __table_args__ = (
+        Index('idx_resource_tag_lookup', 'kind', 'tag', 'resource_id'),
+        UniqueConstraint('resource_id', 'kind', 'tag', name='unique_resource_tag'),
+    )
+
+
 class ResourceKPI(Base):
     """KPIs for resource management"""
     __tablename__ = 'resource_kpis'
@@ -341,6 +410,39 @@ class ResourceKPI(Base):
     )
 
 
+class ResourceKPIRollup(Base):
+    """Daily KPI rollup buckets per provider, maintained on every resource/allocation write
+    
+    Every resource or allocation contributes its value to the bucket of its
+    first day (start_value) and of the day after its last day (end_value),
+    so KPIs of any period are range sums over these buckets. Each bucket
+    also holds the running totals of its provider's and metric's buckets up
+    to it, so a period is read from two buckets per metric.
+    """
+    __tablename__ = 'resource_kpi_rollups'
+    
+    id = Column(Integer, primary_key=True)
+    service_provider_id = Column(Integer, ForeignKey('service_providers_extended.id'), nullable=False)
+    bucket_date = Column(Date, nullable=False)
+    metric = Column(String(50), nullable=False)
+    
+    start_value = Column(Float, default=0, nullable=False)
+    end_value = Column(Float, default=0, nullable=False)
+    
+    # Running totals: start/end values of the buckets up to and including
+    # this one, and the active value summed over the days before it
+    cumulative_start = Column(Float, default=0, nullable=False)
+    cumulative_end = Column(Float, default=0, nullable=False)
+    cumulative_days = Column(Float, default=0, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('service_provider_id', 'metric', 'bucket_date', name='unique_provider_metric_bucket'),
+    )
+
+
 class ResourceNotification(Base):
     """Notifications for resource management"""
     __tablename__ = 'resource_notifications'
@@ -3,20 +3,41 @@ Resource Management API Endpoints
 Backend implementation for the resource management system
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
 from datetime import datetime, date
-from pydantic import BaseModel
+from pydantic import VERSION as PYDANTIC_VERSION, BaseModel, validator
 from decimal import Decimal
+import json
+import math
 import os
+import threading
+import time
 from .services.resource_db_service import ResourceDatabaseService
+from .services.async_resource_db_service import AsyncResourceDatabaseService
+from .services.pagination import next_cursor
+from .services.cache import create_cache
+from .services.http_caching import etag_matches, http_date, make_etag
+from .services.serializers import dumps_json, model_to_dict
+from .services.columnar import encode_columns, negotiate
 from .models.resource_models import Base
 
 # ============================================
 # Pydantic Models (DTOs)
 # ============================================
 
+def parse_json_list(value):
+    """Accept JSON array columns stored as text where a list is expected"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return []
+    return value
+
 class ResourceBase(BaseModel):
     service_provider_id: int
     project_id: Optional[int] = None
@@ -41,6 +62,8 @@ class ResourceBase(BaseModel):
     skills: Optional[List[str]] = []
     equipment: Optional[List[str]] = []
 
+    _parse_json_lists = validator('skills', 'equipment', pre=True, allow_reuse=True)(parse_json_list)
+
 class ResourceCreate(ResourceBase):
     pass
 
@@ -63,6 +86,12 @@ class Resource(ResourceBase):
     class Config:
         orm_mode = True
 
+class ResourceGeoResult(Resource):
+    distance_km: Optional[float] = None
+
+class ResourceMatch(ResourceGeoResult):
+    match_score: float
+
 class ResourceAllocationBase(BaseModel):
     resource_id: int
     trade_id: int
@@ -106,6 +135,8 @@ class ResourceRequestBase(BaseModel):
     location_address: Optional[str] = None
     location_city: Optional[str] = None
     location_postal_code: Optional[str] = None
+    location_latitude: Optional[float] = None
+    location_longitude: Optional[float] = None
     max_distance_km: Optional[float] = None
     max_hourly_rate: Optional[Decimal] = None
     max_total_budget: Optional[Decimal] = None
@@ -115,6 +146,10 @@ class ResourceRequestBase(BaseModel):
     status: Optional[str] = "open"
     deadline_at: Optional[datetime] = None
 
+    _parse_json_lists = validator(
+        'required_skills', 'required_equipment', pre=True, allow_reuse=True
+    )(parse_json_list)
+
 class ResourceRequest(ResourceRequestBase):
     id: int
     requested_by: int
@@ -185,21 +220,42 @@ class BulkAllocationCreate(BaseModel):
 
 router = APIRouter(prefix="/api/v1/resources", tags=["resources"])
 
-# Initialize database service
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "sqlite:///./resources.db"  # Default to SQLite for development
-)
-db_service = ResourceDatabaseService(DATABASE_URL)
+# Database service, created on first use: building it on import would
+# connect (and create the SQLite file) wherever the module is imported
+_db_service: Optional[AsyncResourceDatabaseService] = None
+_db_service_lock = threading.Lock()
 
-# Dependency to get DB session
-def get_db():
-    """Get database session"""
-    session = db_service.get_session()
-    try:
-        yield session
-    finally:
-        session.close()
+def get_db_service() -> AsyncResourceDatabaseService:
+    """Get the database service, configured from the environment on first use"""
+    global _db_service
+    with _db_service_lock:
+        if _db_service is None:
+            database_url = os.getenv(
+                "DATABASE_URL",
+                "sqlite:///./resources.db"  # Default to SQLite for development
+            )
+            _db_service = AsyncResourceDatabaseService(
+                ResourceDatabaseService(
+                    database_url,
+                    use_geo_index=os.getenv("RESOURCE_GEO_INDEX", "false").lower() == "true",
+                    statistics_cache_ttl=float(os.getenv("RESOURCE_STATISTICS_CACHE_TTL", "10")),
+                    read_cache=create_cache(
+                        float(os.getenv("RESOURCE_READ_CACHE_TTL", "30")),
+                        max_entries=10000,
+                        redis_url=os.getenv("RESOURCE_CACHE_REDIS_URL")
+                    ),
+                    replica_urls=[
+                        url.strip() for url in os.getenv("RESOURCE_DB_REPLICA_URLS", "").split(",") if url.strip()
+                    ]
+                ),
+                database_url
+            )
+        return _db_service
+
+# Clients that wrote recently read from the primary until replicas catch up.
+# The deadline travels with the client as a cookie, so it holds on every worker.
+REPLICA_STICKY_SECONDS = float(os.getenv("RESOURCE_REPLICA_STICKY_SECONDS", "5"))
+READ_PRIMARY_COOKIE = "read_primary_until"
 
 # Dependency to get current user (simplified for demo)
 def get_current_user():
@@ -208,23 +264,224 @@ def get_current_user():
     # For now, return mock user
     return {"id": 1, "email": "test@example.com", "role": "service_provider"}
 
+# Dependency to get DB session
+async def get_db(request: Request, response: Response):
+    """Get async database session on the primary
+    
+    Writes set the read_primary_until cookie, sending the client's reads to
+    the primary for RESOURCE_REPLICA_STICKY_SECONDS (read-your-writes).
+    """
+    if request.method not in ("GET", "HEAD"):
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            f"{time.time() + REPLICA_STICKY_SECONDS:.3f}",
+            max_age=math.ceil(REPLICA_STICKY_SECONDS),
+            httponly=True,
+            samesite="lax"
+        )
+    async with get_db_service().get_session() as session:
+        yield session
+
+# Dependency to get DB session for read-only endpoints
+async def get_read_db(request: Request):
+    """Get async database session for read-only queries
+    
+    Served by a read replica unless the client sends X-Read-Consistency: primary
+    or a read_primary_until cookie from a recent write. A replica that cannot
+    be reached or fails a query is taken out of rotation; the former falls
+    back to the primary.
+    """
+    session = read_session(request)
+    try:
+        await session.connection()
+    except DBAPIError:
+        await session.close()
+        if not get_db_service().mark_replica_failed(session):
+            raise
+        session = get_db_service().get_session()
+    
+    async with session:
+        try:
+            yield session
+        except DBAPIError:
+            get_db_service().mark_replica_failed(session)
+            raise
+
+def read_session(request: Request) -> AsyncSession:
+    """Get the session get_read_db would serve, for endpoints managing it themselves"""
+    use_primary = (
+        request.headers.get("X-Read-Consistency", "").lower() == "primary"
+        or wrote_recently(request)
+    )
+    return get_db_service().get_session() if use_primary else get_db_service().get_read_session()
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client's read_primary_until cookie is still running"""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+async def ndjson_lines(session: AsyncSession, rows: AsyncIterator, model: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """Serialize streamed dict rows as newline-delimited JSON, closing the session at the end
+    
+    The session is owned by the stream rather than a dependency, as it has
+    to stay open until the last row has been sent.
+    """
+    fields = schema_fields(model)
+    async with session:
+        try:
+            async for row in rows:
+                yield dumps_json(schema_row(fields, row), DECIMALS_AS_STRINGS) + b"\n"
+        except DBAPIError:
+            get_db_service().mark_replica_failed(session)
+            raise
+
 # Dependency to get current service provider ID
 def get_current_provider_id(current_user = Depends(get_current_user)):
     """Get current service provider ID"""
     # Use the actual user ID from the current user
     return current_user.get("id", 1)
 
+async def not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    scope: str,
+    provider_id: int,
+    *params,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Optional[Response]:
+    """Set ETag/Last-Modified from the scope's change marker, or answer 304
+    
+    Returns the 304 response when If-None-Match matches, None when the
+    endpoint should build the full response.
+    """
+    count, last_modified = await get_db_service().get_change_marker(db, scope, provider_id, start_date, end_date)
+    return conditional_response(
+        request, response, last_modified, scope, provider_id, start_date, end_date, *params, count, last_modified
+    )
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    last_modified: Optional[datetime],
+    *parts
+) -> Optional[Response]:
+    """Set ETag (over parts and the negotiated format) and Last-Modified, or answer 304"""
+    headers = {
+        "ETag": make_etag(*parts, negotiate(request.headers.get("Accept"))),
+        "Vary": "Accept",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    
+    if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# ==================== Fast Serialization ====================
+
+# Pydantic 2 writes decimals to JSON as strings, Pydantic 1 as numbers
+DECIMALS_AS_STRINGS = PYDANTIC_VERSION.startswith('2')
+
+# Fields stored as JSON text that the models parse into lists
+JSON_LIST_FIELDS = {'skills', 'equipment', 'required_skills', 'required_equipment'}
+
+class FastJSONResponse(Response):
+    """JSON response encoded by dumps_json, for rows shaped by schema_row"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content, DECIMALS_AS_STRINGS)
+
+_schema_fields = {}
+
+def schema_fields(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Field names of a response model, in output order, with their defaults"""
+    if model not in _schema_fields:
+        fields = getattr(model, 'model_fields', None) or model.__fields__
+        _schema_fields[model] = {name: field.default for name, field in fields.items()}
+    return _schema_fields[model]
+
+def schema_types(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Field names of a response model, in output order, with their annotations"""
+    fields = getattr(model, 'model_fields', None) or model.__fields__
+    return {
+        name: getattr(field, 'annotation', None) or getattr(field, 'outer_type_', None)
+        for name, field in fields.items()
+    }
+
+def schema_row(fields: Dict[str, Any], row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a dict row like the model's JSON output, without validating it"""
+    shaped = {name: row.get(name, default) for name, default in fields.items()}
+    for name in JSON_LIST_FIELDS.intersection(shaped):
+        shaped[name] = parse_json_list(shaped[name])
+    return shaped
+
+def fast_json_response(response: Response, model: Type[BaseModel], rows: List[Dict[str, Any]]) -> FastJSONResponse:
+    """Serialize dict rows in the model's response schema, skipping Pydantic
+    
+    Headers already set on the endpoint's response (ETag, X-Next-Cursor)
+    are carried over.
+    """
+    fields = schema_fields(model)
+    return FastJSONResponse(
+        [schema_row(fields, row) for row in rows],
+        headers={key: value for key, value in response.headers.items() if key != "content-length"}
+    )
+
+def columnar_response(
+    request: Request,
+    response: Response,
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]]
+) -> Optional[Response]:
+    """Encode rows column-wise if the Accept header asks for MessagePack or Arrow
+    
+    Returns None when JSON was negotiated, which stays the default.
+    """
+    response.headers["Vary"] = "Accept"
+    media_type = negotiate(request.headers.get("Accept"))
+    if media_type is None:
+        return None
+    fields = schema_fields(model)
+    return Response(
+        encode_columns(
+            media_type, [schema_row(fields, row) for row in rows], schema_types(model), DECIMALS_AS_STRINGS
+        ),
+        media_type=media_type,
+        headers={key: value for key, value in response.headers.items() if key != "content-length"}
+    )
+
+def list_response(
+    request: Request,
+    response: Response,
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]]
+) -> Response:
+    """Serialize dict rows column-wise or as JSON, as negotiated"""
+    return columnar_response(request, response, model, rows) or fast_json_response(response, model, rows)
+
+def set_next_cursor(response: Response, items: list, limit: Optional[int], sort_attribute: str):
+    """Expose the cursor of the next page in the X-Next-Cursor header"""
+    cursor = next_cursor(items, limit, sort_attribute)
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
 # ==================== Resources CRUD ====================
 
 @router.post("/", response_model=Resource)
 async def create_resource(
     resource: ResourceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     provider_id: int = Depends(get_current_provider_id)
 ):
     """Create a new resource"""
     try:
-        db_resource = db_service.create_resource(
+        db_resource = await get_db_service().create_resource(
             db, 
             resource.dict(), 
             provider_id
@@ -235,27 +492,27 @@ async def create_resource(
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/{resource_id}", response_model=Resource)
+@router.get("/{resource_id:int}", response_model=Resource)
 async def get_resource(
     resource_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get a specific resource by ID"""
-    resource = db_service.get_resource(db, resource_id)
+    resource = await get_db_service().get_resource_cached(db, resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
     return resource
 
-@router.put("/{resource_id}", response_model=Resource)
+@router.put("/{resource_id:int}", response_model=Resource)
 async def update_resource(
     resource_id: int,
     resource: ResourceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update a resource"""
-    updated_resource = db_service.update_resource(
+    updated_resource = await get_db_service().update_resource(
         db, 
         resource_id, 
         resource.dict(exclude_unset=True)
@@ -264,20 +521,22 @@ async def update_resource(
         raise HTTPException(status_code=404, detail="Resource not found")
     return updated_resource
 
-@router.delete("/{resource_id}")
+@router.delete("/{resource_id:int}")
 async def delete_resource(
     resource_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Delete a resource"""
-    success = db_service.delete_resource(db, resource_id)
+    success = await get_db_service().delete_resource(db, resource_id)
     if not success:
         raise HTTPException(status_code=404, detail="Resource not found")
     return {"message": "Resource deleted successfully"}
 
 @router.get("/", response_model=List[Resource])
 async def list_resources(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -286,10 +545,14 @@ async def list_resources(
     service_provider_id: Optional[int] = None,
     limit: int = Query(100, le=1000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
-    """List resources with optional filters"""
+    """List resources with optional filters
+    
+    Pass the X-Next-Cursor header of a page as cursor to fetch the next one.
+    """
     filters = {
         k: v for k, v in {
             'category': category,
@@ -301,12 +564,49 @@ async def list_resources(
         }.items() if v is not None
     }
     
-    return db_service.list_resources(db, filters, limit, offset)
+    try:
+        resources = await get_db_service().list_resources(
+            db, filters, limit, offset, cursor, columns=list(schema_fields(Resource))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, resources, limit, 'start_date')
+    return list_response(request, response, Resource, resources)
+
+@router.get("/export")
+async def export_resources(
+    request: Request,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    min_persons: Optional[int] = None,
+    status: Optional[str] = None,
+    service_provider_id: Optional[int] = None,
+    current_user = Depends(get_current_user)
+):
+    """Export all resources matching the filters as NDJSON, streamed row by row"""
+    filters = {
+        k: v for k, v in {
+            'category': category,
+            'start_date': start_date,
+            'end_date': end_date,
+            'min_persons': min_persons,
+            'status': status,
+            'service_provider_id': service_provider_id
+        }.items() if v is not None
+    }
+    session = read_session(request)
+    return StreamingResponse(
+        ndjson_lines(session, get_db_service().stream_resources(session, filters), Resource),
+        media_type="application/x-ndjson"
+    )
 
-@router.post("/search/geo", response_model=List[Resource])
+@router.post("/search/geo", response_model=List[ResourceGeoResult])
 async def search_resources_geo(
     params: ResourceSearchParams,
-    db: Session = Depends(get_db),
+    limit: int = Query(100, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Search resources geographically"""
@@ -316,37 +616,59 @@ async def search_resources_geo(
             detail="Latitude, longitude, and radius are required for geo search"
         )
     
-    return db_service.search_resources_geo(
+    return await get_db_service().search_resources_geo(
         db,
         params.latitude,
         params.longitude, 
         params.radius_km,
-        params.dict(exclude={'latitude', 'longitude', 'radius_km'})
+        params.dict(exclude={'latitude', 'longitude', 'radius_km'}, exclude_none=True),
+        limit,
+        offset
     )
 
 @router.get("/my", response_model=List[Resource])
 async def get_my_resources(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     provider_id: int = Depends(get_current_provider_id),
-    user_id: Optional[int] = Query(None)
+    user_id: Optional[int] = Query(None),
+    limit: int = Query(100, le=1000),
+    cursor: Optional[str] = None
 ):
     """Get resources for current user"""
     # Use user_id from query parameter if provided, otherwise use provider_id
     actual_provider_id = user_id if user_id is not None else provider_id
-    filters = {'service_provider_id': actual_provider_id}
-    return db_service.list_resources(db, filters)
+    try:
+        resources, digest = await get_db_service().list_provider_resources_cached(db, actual_provider_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Validators come from the cached page itself, not the live database,
+    # so a page served stale from this worker's cache keeps its own tag
+    last_modified = max(
+        (datetime.fromisoformat(str(resource['updated_at'])) for resource in resources if resource['updated_at']),
+        default=None
+    )
+    cached = conditional_response(
+        request, response, last_modified, 'resources', actual_provider_id, limit, cursor, digest
+    )
+    if cached:
+        return cached
+    set_next_cursor(response, resources, limit, 'start_date')
+    return list_response(request, response, Resource, resources)
 
 # ==================== Allocations ====================
 
 @router.post("/allocations", response_model=ResourceAllocation)
 async def create_allocation(
     allocation: ResourceAllocationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a new resource allocation"""
     try:
-        return db_service.create_allocation(
+        return await get_db_service().create_allocation(
             db,
             allocation.dict(),
             current_user["id"]
@@ -358,20 +680,34 @@ async def create_allocation(
 
 @router.get("/allocations/my", response_model=List[ResourceAllocation])
 async def get_my_allocations(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     provider_id: int = Depends(get_current_provider_id),
-    user_id: Optional[int] = Query(None)
+    user_id: Optional[int] = Query(None),
+    limit: Optional[int] = Query(None, le=1000),
+    cursor: Optional[str] = None
 ):
     """Get allocations for current user"""
     # Use user_id from query parameter if provided, otherwise use provider_id
     actual_provider_id = user_id if user_id is not None else provider_id
-    return db_service.get_allocations_by_provider(db, actual_provider_id)
+    cached = await not_modified(request, response, db, 'allocations', actual_provider_id, limit, cursor)
+    if cached:
+        return cached
+    try:
+        allocations = await get_db_service().get_allocations_by_provider(
+            db, actual_provider_id, limit, cursor, columns=list(schema_fields(ResourceAllocation))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, allocations, limit, 'allocated_start_date')
+    return list_response(request, response, ResourceAllocation, allocations)
 
 @router.put("/allocations/{allocation_id}", response_model=ResourceAllocation)
 async def update_allocation(
     allocation_id: int,
     allocation: ResourceAllocationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update an allocation"""
@@ -385,7 +721,7 @@ async def update_allocation(
 @router.delete("/allocations/{allocation_id}")
 async def delete_allocation(
     allocation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Delete an allocation"""
@@ -394,16 +730,25 @@ async def delete_allocation(
 @router.get("/allocations/trade/{trade_id}", response_model=List[ResourceAllocation])
 async def get_allocations_by_trade(
     trade_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, le=1000),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
-    """Get all allocations for a specific trade"""
-    return db_service.get_allocations_by_trade(db, trade_id)
+    """Get allocations for a specific trade"""
+    try:
+        allocations = await get_db_service().get_allocations_by_trade_cached(db, trade_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_next_cursor(response, allocations, limit, 'allocated_start_date')
+    return list_response(request, response, ResourceAllocation, allocations)
 
 @router.get("/allocations/resource/{resource_id}", response_model=List[ResourceAllocation])
 async def get_allocations_by_resource(
     resource_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all allocations for a specific resource"""
@@ -414,13 +759,16 @@ async def update_allocation_status(
     allocation_id: int,
     status: str,
     notes: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Update allocation status"""
-    allocation = db_service.update_allocation_status(
-        db, allocation_id, status, notes
-    )
+    try:
+        allocation = await get_db_service().update_allocation_status(
+            db, allocation_id, status, notes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not allocation:
         raise HTTPException(status_code=404, detail="Allocation not found")
     return allocation
@@ -428,13 +776,13 @@ async def update_allocation_status(
 @router.post("/allocations/bulk", response_model=List[ResourceAllocation])
 async def bulk_create_allocations(
     data: BulkAllocationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create multiple allocations at once"""
     try:
         allocations_data = [alloc.dict() for alloc in data.allocations]
-        return db_service.bulk_create_allocations(
+        return await get_db_service().bulk_create_allocations(
             db, allocations_data, current_user["id"]
         )
     except ValueError as e:
@@ -449,18 +797,46 @@ async def get_calendar_entries(
     service_provider_id: int,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get calendar entries for a service provider"""
-    return db_service.get_calendar_entries(
+    cached = await not_modified(
+        request, response, db, 'calendar', service_provider_id,
+        start_date=start_date, end_date=end_date
+    )
+    if cached:
+        return cached
+    entries = await get_db_service().get_calendar_entries(
         db, service_provider_id, start_date, end_date
     )
+    return list_response(request, response, ResourceCalendarEntry, entries)
+
+@router.get("/calendar/export")
+async def export_calendar_entries(
+    service_provider_id: int,
+    start_date: date,
+    end_date: date,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """Export daily calendar entries as NDJSON, streamed resource by resource"""
+    session = read_session(request)
+    return StreamingResponse(
+        ndjson_lines(
+            session,
+            get_db_service().stream_calendar_entries(session, service_provider_id, start_date, end_date),
+            ResourceCalendarEntry
+        ),
+        media_type="application/x-ndjson"
+    )
 
 @router.post("/calendar", response_model=ResourceCalendarEntry)
 async def create_calendar_entry(
     entry: ResourceCalendarEntry,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a calendar entry"""
@@ -474,28 +850,39 @@ async def create_calendar_entry(
 @router.get("/kpis", response_model=ResourceKPIs)
 async def get_kpis(
     service_provider_id: int,
+    request: Request,
+    response: Response,
     period_start: Optional[date] = None,
     period_end: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get KPIs for a service provider"""
+    """Get KPIs for a service provider (read-only, served from rollups)"""
     # Default to current month if no period specified
     if not period_start:
         period_start = date.today().replace(day=1)
     if not period_end:
         period_end = date.today()
+    
+    # calculation_date is today, so the representation changes daily
+    cached = await not_modified(
+        request, response, db, 'kpis', service_provider_id, period_start, date.today(),
+        end_date=period_end
+    )
+    if cached:
+        return cached
         
-    return db_service.calculate_kpis(
+    kpis = await get_db_service().get_kpis(
         db, service_provider_id, period_start, period_end
     )
+    return columnar_response(request, response, ResourceKPIs, [model_to_dict(kpis)]) or kpis
 
 @router.post("/kpis/calculate", response_model=ResourceKPIs)
 async def calculate_kpis(
     service_provider_id: int,
     period_start: Optional[date] = None,
     period_end: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Calculate and store KPIs for a service provider"""
@@ -505,21 +892,46 @@ async def calculate_kpis(
     if not period_end:
         period_end = date.today()
         
-    return db_service.calculate_kpis(
+    return await get_db_service().calculate_kpis(
         db, service_provider_id, period_start, period_end
     )
 
+@router.post("/kpis/calculate-batch", response_model=List[ResourceKPIs])
+async def calculate_kpis_batch(
+    request: Request,
+    response: Response,
+    service_provider_ids: Optional[List[int]] = Query(None),
+    periods: List[str] = Query(['month', 'quarter', 'year_to_date']),
+    reference_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Calculate and store KPIs for many service providers and periods in one pass
+    
+    Periods (month, quarter, year_to_date) end on reference_date, today by default.
+    All service providers are calculated unless service_provider_ids is given.
+    """
+    try:
+        kpi_periods = get_db_service().get_kpi_periods(periods, reference_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    kpis = await get_db_service().calculate_kpis_batch(db, kpi_periods, service_provider_ids)
+    return columnar_response(
+        request, response, ResourceKPIs, [model_to_dict(kpi) for kpi in kpis]
+    ) or kpis
+
 # ==================== Notifications ====================
 
 @router.post("/allocations/{allocation_id}/invite")
 async def send_invitation_notification(
     allocation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Send invitation notification for an allocation"""
     # Update allocation status to invited
-    allocation = db_service.update_allocation_status(db, allocation_id, "invited")
+    allocation = await get_db_service().update_allocation_status(db, allocation_id, "invited")
     if not allocation:
         raise HTTPException(status_code=404, detail="Allocation not found")
     
@@ -531,7 +943,7 @@ async def send_invitation_notification(
 @router.post("/allocations/{allocation_id}/view")
 async def mark_invitation_viewed(
     allocation_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Mark invitation as viewed"""
@@ -543,65 +955,71 @@ async def mark_invitation_viewed(
 @router.get("/statistics")
 async def get_resource_statistics(
     service_provider_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get resource statistics"""
-    return {
-        "total_resources": 100,
-        "active_resources": 75,
-        "average_utilization": 65.5,
-        "total_revenue": 150000
-    }
+    return await get_db_service().get_resource_statistics(db, service_provider_id)
+
+@router.get("/pool-metrics")
+async def get_pool_metrics(
+    current_user = Depends(get_current_user)
+):
+    """Get database connection pool usage"""
+    return get_db_service().get_pool_metrics()
 
 @router.get("/availability-matrix")
 async def get_availability_matrix(
     category: str,
     start_date: date,
     end_date: date,
-    db: Session = Depends(get_db),
+    group_by: str = "resource",
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get availability matrix for resources"""
-    # TODO: Generate availability matrix
-    return {
-        "category": category,
-        "period": f"{start_date} to {end_date}",
-        "availability": []
-    }
+    """Get availability matrix for resources
+    
+    Rows are resources (or providers with group_by=provider), listed in
+    row_ids; availability[i][d] holds the free persons of row i on
+    start_date + d days.
+    """
+    try:
+        return await get_db_service().get_availability_matrix(
+            db, category, start_date, end_date, group_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # ==================== Requests ====================
 
 @router.post("/requests", response_model=ResourceRequest)
 async def create_request(
     request: ResourceRequestBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Create a resource request"""
-    return {
-        "id": 1,
-        **request.dict(),
-        "requested_by": current_user.id,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
-    }
+    return await get_db_service().create_request(db, request.dict(), current_user["id"])
 
 @router.get("/requests/trade/{trade_id}", response_model=List[ResourceRequest])
 async def get_requests_by_trade(
     trade_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get resource requests for a trade"""
-    return []
+    return await get_db_service().get_requests_by_trade(db, trade_id)
 
-@router.get("/requests/{request_id}/match", response_model=List[Resource])
+@router.get("/requests/{request_id}/match", response_model=List[ResourceMatch])
 async def match_resources_for_request(
     request_id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Match resources for a request"""
-    # TODO: Implement matching algorithm
-    return []
\ No newline at end of file
+    """Match resources for a request, best match first"""
+    request = await get_db_service().get_request(db, request_id)
+    if not request:
+        raise HTTPException(status_code=404, detail="Resource request not found")
+    
+    return await get_db_service().match_resources_for_request(db, request, limit)
\ No newline at end of file
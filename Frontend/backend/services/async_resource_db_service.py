@@ -0,0 +1,217 @@
+"""
+Async Database Service for Resource Management
+Runs ResourceDatabaseService on SQLAlchemy's asyncio engine (asyncpg/aiosqlite)
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import date
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..models.resource_models import Resource
+from .resource_db_service import ResourceDatabaseService
+from .db_config import configure_sqlite_pragmas, engine_options, pool_metrics
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip by the streaming exports
+EXPORT_CHUNK_SIZE = 1000
+
+# Async drivers per database URL scheme
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """Switch a database URL to its asyncio driver"""
+    scheme, separator, rest = database_url.partition('://')
+    if '+' in scheme:
+        scheme = scheme.split('+', 1)[0]
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for database URL scheme: {scheme}")
+    return ASYNC_DRIVERS[scheme] + separator + rest
+
+
+def _run_sync(name: str):
+    """Async wrapper running a ResourceDatabaseService method on the session's connection"""
+    async def method(self, session: AsyncSession, *args, **kwargs):
+        service_method = getattr(self.service, name)
+        return await session.run_sync(
+            lambda sync_session: service_method(sync_session, *args, **kwargs)
+        )
+    method.__name__ = name
+    method.__doc__ = getattr(ResourceDatabaseService, name).__doc__
+    return method
+
+
+class AsyncResourceDatabaseService:
+    """Async variant of ResourceDatabaseService
+    
+    Queries run through an AsyncSession, so the event loop keeps serving
+    other requests while one waits on the database. The service logic and
+    its in-process indexes and caches are shared with the wrapped
+    ResourceDatabaseService: every method runs it via AsyncSession.run_sync.
+    """
+    
+    def __init__(self, service: ResourceDatabaseService, database_url: str):
+        """Initialize async database service
+        
+        Args:
+            service: Synchronous service providing the database logic
+            database_url: Database connection string, switched to asyncpg or aiosqlite
+        """
+        self.service = service
+        self.engine = create_async_engine(async_database_url(database_url), **engine_options(database_url))
+        if service.db_type == 'sqlite':
+            configure_sqlite_pragmas(self.engine.sync_engine)
+        
+        # Async twins of the service's replicas, routed by the same ReplicaRouter index
+        self.replica_engines = []
+        for replica_url in service.replica_urls:
+            replica_engine = create_async_engine(async_database_url(replica_url), **engine_options(replica_url))
+            if service.db_type == 'sqlite':
+                configure_sqlite_pragmas(replica_engine.sync_engine)
+            self.replica_engines.append(replica_engine)
+        # Results are serialized after commit, outside the session's greenlet,
+        # so committed objects must not expire and lazy-load
+        self.SessionLocal = async_sessionmaker(bind=self.engine, expire_on_commit=False, autoflush=False)
+    
+    def get_session(self) -> AsyncSession:
+        """Get async database session"""
+        return self.SessionLocal()
+    
+    def get_read_session(self) -> AsyncSession:
+        """Get async session for read-only queries, on a healthy replica if any"""
+        replica = self.service.replicas.choose()
+        if replica is None:
+            return self.SessionLocal()
+        session = self.SessionLocal(bind=self.replica_engines[replica])
+        session.info['replica'] = replica
+        return session
+    
+    def mark_replica_failed(self, session: AsyncSession) -> bool:
+        """Skip the replica a read session failed on until its next successful health check
+        
+        Returns False if the session was on the primary.
+        """
+        replica = session.info.get('replica')
+        if replica is None:
+            return False
+        logger.warning(f"Read replica {replica} failed a query, routing reads elsewhere")
+        self.service.replicas.mark_unhealthy(replica)
+        return True
+    
+    def get_pool_metrics(self) -> dict:
+        """Connection pool usage of the async and the sync engine"""
+        return {
+            'async': pool_metrics(self.engine.sync_engine),
+            'sync': pool_metrics(self.service.engine),
+            'replicas': [pool_metrics(engine.sync_engine) for engine in self.replica_engines],
+        }
+    
+    def get_kpi_periods(self, period_names: List[str], reference_date=None) -> List[tuple]:
+        """Get (period_start, period_end) of named periods ending on reference_date"""
+        return self.service.get_kpi_periods(period_names, reference_date)
+    
+    # ==================== Resources CRUD ====================
+    
+    create_resource = _run_sync('create_resource')
+    get_resource = _run_sync('get_resource')
+    update_resource = _run_sync('update_resource')
+    delete_resource = _run_sync('delete_resource')
+    list_resources = _run_sync('list_resources')
+    search_resources_geo = _run_sync('search_resources_geo')
+    
+    # ==================== Allocations ====================
+    
+    create_allocation = _run_sync('create_allocation')
+    update_allocation_status = _run_sync('update_allocation_status')
+    get_allocations_by_trade = _run_sync('get_allocations_by_trade')
+    get_allocations_by_provider = _run_sync('get_allocations_by_provider')
+    bulk_create_allocations = _run_sync('bulk_create_allocations')
+    
+    # ==================== Calendar & Availability ====================
+    
+    get_calendar_entries = _run_sync('get_calendar_entries')
+    get_availability_matrix = _run_sync('get_availability_matrix')
+    
+    # ==================== Streaming Exports ====================
+    
+    async def stream_resources(
+        self,
+        session: AsyncSession,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream all resources matching filters as dicts, ordered by (start_date, id)
+        
+        Rows come from a server-side cursor chunk_size at a time, so memory
+        stays flat however many resources match. columns defaults to all
+        Resource columns.
+        """
+        if columns is None:
+            columns = [attribute.key for attribute in Resource.__mapper__.column_attrs]
+        statement = self.service.resource_export_statement(filters, columns)
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+        async for row in result.mappings():
+            yield dict(row)
+    
+    async def stream_calendar_entries(
+        self,
+        session: AsyncSession,
+        provider_id: int,
+        start_date: date,
+        end_date: date,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a provider's daily calendar entry dicts, resource by resource
+        
+        Unlike get_calendar_entries the entries are grouped by resource rather
+        than sorted by date: intervals are streamed in resource order and each
+        resource is expanded as soon as its last interval has arrived.
+        Provider-level entries (without a resource) follow at the end.
+        """
+        statement = self.service.calendar_interval_statement(provider_id, start_date, end_date)
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+        
+        intervals = []
+        async for interval in result:
+            if intervals and interval.resource_id != intervals[0].resource_id:
+                for entry in self.service.expand_calendar_intervals(intervals, start_date, end_date):
+                    yield entry
+                intervals = []
+            intervals.append(interval)
+        for entry in self.service.expand_calendar_intervals(intervals, start_date, end_date):
+            yield entry
+        
+        statement = self.service.provider_calendar_entry_statement(provider_id, start_date, end_date)
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+        async for row in result:
+            yield self.service.provider_calendar_entry(row)
+    
+    # ==================== Requests & Matching ====================
+    
+    create_request = _run_sync('create_request')
+    get_request = _run_sync('get_request')
+    get_requests_by_trade = _run_sync('get_requests_by_trade')
+    match_resources_for_request = _run_sync('match_resources_for_request')
+    
+    # ==================== Change Markers & Read Cache ====================
+    
+    get_change_marker = _run_sync('get_change_marker')
+    
+    get_resource_cached = _run_sync('get_resource_cached')
+    list_provider_resources_cached = _run_sync('list_provider_resources_cached')
+    get_allocations_by_trade_cached = _run_sync('get_allocations_by_trade_cached')
+    
+    # ==================== Statistics & KPIs ====================
+    
+    get_resource_statistics = _run_sync('get_resource_statistics')
+    calculate_kpis = _run_sync('calculate_kpis')
+    calculate_kpis_batch = _run_sync('calculate_kpis_batch')
+    get_kpis = _run_sync('get_kpis')
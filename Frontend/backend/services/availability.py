@@ -0,0 +1,90 @@
+"""
+Availability matrix engine for Resource Management
+Free persons per resource (or provider) and day, computed with difference arrays
+"""
+
+from typing import Iterable, List, Sequence, Tuple
+from datetime import date
+
+import numpy as np
+
+
+def day_offsets(dates: Sequence[date], origin: date) -> np.ndarray:
+    """Get day offsets of dates relative to origin"""
+    return (
+        np.asarray(dates, dtype='datetime64[D]') - np.datetime64(origin, 'D')
+    ).astype(np.int64)
+
+
+def interval_matrix(
+    rows: np.ndarray,
+    starts: Sequence[date],
+    ends: Sequence[date],
+    values: Sequence[int],
+    row_count: int,
+    start_date: date,
+    end_date: date
+) -> np.ndarray:
+    """Sum interval values per row and day of [start_date, end_date]
+
+    Each interval adds its value at its (clipped) first day and removes it
+    the day after its last day; a cumulative sum along the day axis then
+    yields the per-day totals.
+    """
+    days = (end_date - start_date).days + 1
+    diff = np.zeros((row_count, days + 1), dtype=np.int64)
+    if len(rows):
+        first = np.clip(day_offsets(starts, start_date), 0, days)
+        last = np.clip(day_offsets(ends, start_date) + 1, 0, days)
+        values = np.asarray(values, dtype=np.int64)
+        np.add.at(diff, (rows, first), values)
+        np.add.at(diff, (rows, last), -values)
+    return np.cumsum(diff, axis=1)[:, :days]
+
+
+def free_persons_matrix(
+    start_date: date,
+    end_date: date,
+    resources: Iterable[Tuple[int, date, date, int]],
+    bookings: Iterable[Tuple[int, date, date, int]]
+) -> Tuple[List[int], np.ndarray]:
+    """Free persons per resource and day
+
+    Args:
+        resources: (resource_id, start_date, end_date, person_count) rows
+        bookings: (resource_id, start_date, end_date, persons) booked allocations
+
+    Returns:
+        (resource_ids, matrix) - matrix row i holds the free persons of
+        resource_ids[i] for each day of [start_date, end_date]
+    """
+    resources = list(resources)
+    resource_ids = [resource[0] for resource in resources]
+    row_of = {resource_id: row for row, resource_id in enumerate(resource_ids)}
+
+    capacity = interval_matrix(
+        np.arange(len(resources), dtype=np.int64),
+        [resource[1] for resource in resources],
+        [resource[2] for resource in resources],
+        [resource[3] for resource in resources],
+        len(resources), start_date, end_date
+    )
+
+    bookings = [booking for booking in bookings if booking[0] in row_of]
+    booked = interval_matrix(
+        np.array([row_of[booking[0]] for booking in bookings], dtype=np.int64),
+        [booking[1] for booking in bookings],
+        [booking[2] for booking in bookings],
+        [booking[3] for booking in bookings],
+        len(resources), start_date, end_date
+    )
+
+    return resource_ids, np.maximum(capacity - booked, 0)
+
+
+def group_rows(keys: Sequence[int], matrix: np.ndarray) -> Tuple[List[int], np.ndarray]:
+    """Sum matrix rows sharing the same key (e.g. resources of one provider)"""
+    group_ids, groups = np.unique(np.asarray(keys, dtype=np.int64), return_inverse=True)
+    grouped = np.zeros((len(group_ids), matrix.shape[1]), dtype=matrix.dtype)
+    np.add.at(grouped, groups.reshape(-1), matrix)
+    return group_ids.tolist(), grouped
@@ -0,0 +1,130 @@
+"""
+Caches for Resource Management
+In-process LRU caches and a Redis-compatible backend, with entries that expire after a time-to-live
+"""
+
+from typing import Any, Hashable, Optional
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+import json
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry
+
+    Entries expire ttl_seconds after they were set; when max_entries is
+    reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Cache a value"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: Hashable):
+        """Drop cached values"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all cached values"""
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Cache on a Redis-compatible server, shared by all workers
+
+    Values are stored as JSON, so cached dates, datetimes and decimals come
+    back as ISO strings and decimal strings. Tuple keys are joined with ':'
+    under a key prefix.
+    """
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = 'resources'):
+        """Initialize Redis cache
+
+        Args:
+            client: Redis client (redis.Redis or a compatible stand-in)
+            ttl_seconds: Default expiry of cached values
+            prefix: Namespace of the cache keys
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or default if it is missing or expired"""
+        payload = self.client.get(self._key(key))
+        if payload is None:
+            return default
+        return json.loads(payload)
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Cache a value"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.client.set(
+            self._key(key),
+            json.dumps(value, default=_json_default),
+            px=max(int(ttl * 1000), 1)
+        )
+
+    def delete(self, *keys: Hashable):
+        """Drop cached values"""
+        if keys:
+            self.client.delete(*[self._key(key) for key in keys])
+
+    def clear(self):
+        """Drop all cached values under the key prefix"""
+        keys = list(self.client.scan_iter(match=f'{self.prefix}:*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def _key(self, key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return ':'.join([self.prefix] + [str(part) for part in parts])
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def create_cache(ttl_seconds: float, max_entries: int = 1024, redis_url: Optional[str] = None):
+    """Create a Redis cache if redis_url is given, an in-process TTLCache otherwise
+
+    The redis package is only needed when a Redis URL is configured.
+    """
+    if not redis_url:
+        return TTLCache(ttl_seconds, max_entries)
+    import redis
+    return RedisCache(redis.Redis.from_url(redis_url), ttl_seconds)
@@ -0,0 +1,171 @@
+"""
+Capacity timelines for Resource Management
+Per-resource segment trees answering "peak allocated persons in [start, end]"
+"""
+
+from typing import Any, Iterable, Optional, Tuple
+from collections import OrderedDict
+from datetime import date
+import threading
+
+
+class CapacityTimeline:
+    """Allocated persons per day over a resource's availability period
+
+    A segment tree over the days of [start_date, end_date] with range add
+    and range max, so both booking an allocation and asking for the peak
+    allocation in a period take O(log days).
+    """
+
+    def __init__(self, start_date: date, end_date: date, version: Any = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.version = version
+        self.size = (end_date - start_date).days + 1
+        # _max[node] is the peak of the node's segment including its own pending add
+        self._max = [0] * (4 * self.size)
+        self._add = [0] * (4 * self.size)
+
+    def add(self, start_date: date, end_date: date, persons: int):
+        """Add persons to every day of [start_date, end_date] (negative to release)"""
+        lo, hi = self._clip(start_date, end_date)
+        if lo <= hi:
+            self._range_add(1, 0, self.size - 1, lo, hi, persons)
+
+    def copy(self) -> 'CapacityTimeline':
+        """Get an independent copy, e.g. to stage bookings until they are committed"""
+        timeline = CapacityTimeline.__new__(CapacityTimeline)
+        timeline.__dict__.update(self.__dict__)
+        timeline._max = list(self._max)
+        timeline._add = list(self._add)
+        return timeline
+
+    def peak(self, start_date: date, end_date: date) -> int:
+        """Get the peak allocated persons on any day of [start_date, end_date]"""
+        lo, hi = self._clip(start_date, end_date)
+        if lo > hi:
+            return 0
+        return self._range_max(1, 0, self.size - 1, lo, hi)
+
+    def _clip(self, start_date: date, end_date: date) -> Tuple[int, int]:
+        lo = max((start_date - self.start_date).days, 0)
+        hi = min((end_date - self.start_date).days, self.size - 1)
+        return lo, hi
+
+    def _range_add(self, node: int, left: int, right: int, lo: int, hi: int, value: int):
+        if hi < left or right < lo:
+            return
+        if lo <= left and right <= hi:
+            self._max[node] += value
+            self._add[node] += value
+            return
+        mid = (left + right) // 2
+        self._range_add(2 * node, left, mid, lo, hi, value)
+        self._range_add(2 * node + 1, mid + 1, right, lo, hi, value)
+        self._max[node] = self._add[node] + max(self._max[2 * node], self._max[2 * node + 1])
+
+    def _range_max(self, node: int, left: int, right: int, lo: int, hi: int) -> Optional[int]:
+        if hi < left or right < lo:
+            return None
+        if lo <= left and right <= hi:
+            return self._max[node]
+        mid = (left + right) // 2
+        peaks = [
+            peak for peak in (
+                self._range_max(2 * node, left, mid, lo, hi),
+                self._range_max(2 * node + 1, mid + 1, right, lo, hi)
+            )
+            if peak is not None
+        ]
+        return self._add[node] + max(peaks)
+
+
+class CapacityTimelineIndex:
+    """Process-local CapacityTimeline per resource
+
+    Timelines are built from the booked allocations on first use and kept
+    current by the allocation write paths of ResourceDatabaseService. Each
+    timeline records the version of the resource row it was built at (its
+    updated_at, touched by every booking change); a timeline whose version
+    no longer matches the row, e.g. after a booking by another worker, is
+    treated as missing and rebuilt. At most max_entries timelines are
+    kept, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._timelines: "OrderedDict[int, CapacityTimeline]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._timelines)
+
+    def get(
+        self,
+        resource_id: int,
+        start_date: date,
+        end_date: date,
+        version: Any = None
+    ) -> Optional[CapacityTimeline]:
+        """Get a resource's timeline if it covers exactly [start_date, end_date] at version"""
+        with self._lock:
+            timeline = self._timelines.get(resource_id)
+            if timeline is not None:
+                self._timelines.move_to_end(resource_id)
+        if timeline is None or (timeline.start_date, timeline.end_date, timeline.version) != (
+            start_date, end_date, version
+        ):
+            return None
+        return timeline
+
+    def build(
+        self,
+        resource_id: int,
+        start_date: date,
+        end_date: date,
+        bookings: Iterable[Tuple[date, date, int]],
+        version: Any = None
+    ) -> CapacityTimeline:
+        """Build and store a resource's timeline from booked (start, end, persons) periods"""
+        timeline = CapacityTimeline(start_date, end_date, version)
+        for booked_start, booked_end, persons in bookings:
+            timeline.add(booked_start, booked_end, persons)
+        self.store(resource_id, timeline)
+        return timeline
+
+    def store(self, resource_id: int, timeline: CapacityTimeline):
+        """Store a resource's timeline, evicting the least recently used beyond max_entries"""
+        with self._lock:
+            self._timelines[resource_id] = timeline
+            self._timelines.move_to_end(resource_id)
+            while len(self._timelines) > self.max_entries:
+                self._timelines.popitem(last=False)
+
+    def book(
+        self,
+        resource_id: int,
+        start_date: date,
+        end_date: date,
+        persons: int,
+        previous_version: Any = None,
+        version: Any = None
+    ):
+        """Apply a committed booking change to a resource's timeline if it is loaded
+        
+        The change moved the resource row from previous_version to version;
+        a timeline at any other version missed a change and is dropped.
+        """
+        with self._lock:
+            timeline = self._timelines.get(resource_id)
+            if timeline is None:
+                return
+            if timeline.version != previous_version:
+                del self._timelines[resource_id]
+                return
+            timeline.add(start_date, end_date, persons)
+            timeline.version = version
+
+    def invalidate(self, resource_id: int):
+        """Drop a resource's timeline"""
+        with self._lock:
+            self._timelines.pop(resource_id, None)
@@ -0,0 +1,157 @@
+"""
+Columnar response encodings for Resource Management
+MessagePack column arrays and Arrow IPC streams or files, chosen by content negotiation
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache, partial
+import importlib.util
+import typing
+
+from .serializers import json_default
+
+MSGPACK_MEDIA_TYPE = 'application/vnd.msgpack'
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+ARROW_FILE_MEDIA_TYPE = 'application/vnd.apache.arrow.file'
+
+# Accept values naming the same encodings
+MEDIA_TYPE_ALIASES = {
+    'application/msgpack': MSGPACK_MEDIA_TYPE,
+    'application/x-msgpack': MSGPACK_MEDIA_TYPE,
+}
+
+# Package each encoding needs; encodings whose package is missing are not offered
+ENCODING_PACKAGES = {
+    MSGPACK_MEDIA_TYPE: 'msgpack',
+    ARROW_MEDIA_TYPE: 'pyarrow',
+    ARROW_FILE_MEDIA_TYPE: 'pyarrow',
+}
+
+JSON_MEDIA_TYPES = {'application/json', 'application/*', '*/*'}
+
+
+@lru_cache(maxsize=None)
+def available_media_types() -> List[str]:
+    """Columnar media types whose encoder package is installed"""
+    return [
+        media_type for media_type, package in ENCODING_PACKAGES.items()
+        if importlib.util.find_spec(package) is not None
+    ]
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """Get the columnar media type an Accept header prefers, or None for JSON
+
+    The highest q-value wins, the earlier entry on ties; JSON stays the
+    default for missing, wildcard or unsupported Accept headers.
+    """
+    if not accept:
+        return None
+
+    offered = available_media_types()
+    chosen, chosen_q = None, 0.0
+    for item in accept.split(','):
+        media_type, *params = [part.strip() for part in item.split(';')]
+        media_type = media_type.lower()
+        media_type = MEDIA_TYPE_ALIASES.get(media_type, media_type)
+
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        if q > chosen_q and (media_type in offered or media_type in JSON_MEDIA_TYPES):
+            chosen = media_type if media_type in offered else None
+            chosen_q = q
+    return chosen
+
+
+def to_columns(rows: List[Dict[str, Any]], names: List[str]) -> Dict[str, list]:
+    """Transpose dict rows into one value array per name"""
+    return {name: [row[name] for row in rows] for name in names}
+
+
+def encode_msgpack(
+    columns: Dict[str, list],
+    types: Dict[str, Any],
+    decimals_as_strings: bool = True
+) -> bytes:
+    """Encode columns as a MessagePack map of column name to value array
+
+    Dates, datetimes and decimals are written as in the JSON responses;
+    decimals in float-annotated columns as floats.
+    """
+    import msgpack
+    for name, values in columns.items():
+        if _optional_type(types.get(name)) is float:
+            columns[name] = [float(value) if isinstance(value, Decimal) else value for value in values]
+    default = partial(json_default, decimals_as_strings=decimals_as_strings)
+    return msgpack.packb(columns, default=default, use_bin_type=True)
+
+
+def encode_arrow(columns: Dict[str, list], types: Dict[str, Any], file_format: bool = False) -> bytes:
+    """Encode columns as an Arrow IPC stream, typed from the columns' Python annotations
+
+    With file_format, the Arrow IPC file format (random access, with footer) is written instead.
+    """
+    import pyarrow as pa
+
+    arrays = []
+    for name, values in columns.items():
+        arrow_type = _arrow_type(pa, types.get(name))
+        try:
+            arrays.append(pa.array(values, type=arrow_type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # ISO strings, e.g. rows read back from the Redis cache
+            arrays.append(pa.array(values).cast(arrow_type))
+    table = pa.Table.from_arrays(arrays, names=list(columns))
+
+    sink = pa.BufferOutputStream()
+    new_writer = pa.ipc.new_file if file_format else pa.ipc.new_stream
+    with new_writer(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_columns(
+    media_type: str,
+    rows: List[Dict[str, Any]],
+    types: Dict[str, Any],
+    decimals_as_strings: bool = True
+) -> bytes:
+    """Encode dict rows, keyed by the names of types, in a columnar media type"""
+    columns = to_columns(rows, list(types))
+    if media_type in (ARROW_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE):
+        return encode_arrow(columns, types, file_format=media_type == ARROW_FILE_MEDIA_TYPE)
+    return encode_msgpack(columns, types, decimals_as_strings)
+
+
+def _optional_type(annotation: Any) -> Any:
+    """Unwrap Optional[X] to X"""
+    if typing.get_origin(annotation) is typing.Union:
+        return next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    return annotation
+
+
+def _arrow_type(pa, annotation: Any):
+    """Arrow type of a Python annotation, None (inferred) if it has no fixed mapping"""
+    annotation = _optional_type(annotation)
+    if typing.get_origin(annotation) is list:
+        item_type = _arrow_type(pa, typing.get_args(annotation)[0])
+        return pa.list_(item_type) if item_type is not None else None
+    return {
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bool: pa.bool_(),
+        date: pa.date32(),
+        datetime: pa.timestamp('us'),
+        # DECIMAL columns are all scale 2
+        Decimal: pa.decimal128(18, 2),
+    }.get(annotation)
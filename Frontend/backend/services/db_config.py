@@ -0,0 +1,99 @@
+"""
+Database engine configuration for Resource Management
+Connection pool settings from the environment, SQLite pragmas and pool metrics
+"""
+
+from typing import Any, Dict
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+def is_sqlite_memory(database_url: str) -> bool:
+    """Whether a database URL points at an in-memory SQLite database"""
+    return database_url.startswith('sqlite') and (
+        ':memory:' in database_url or database_url.rstrip('/').endswith(':')
+    )
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine
+
+    Environment:
+        RESOURCE_DB_POOL_SIZE: Connections kept open (default 10)
+        RESOURCE_DB_MAX_OVERFLOW: Extra connections under load (default 20)
+        RESOURCE_DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 30)
+        RESOURCE_DB_POOL_RECYCLE: Seconds after which connections are replaced (default 1800)
+        RESOURCE_DB_POOL_PRE_PING: Test connections before use (default true)
+    """
+    options: Dict[str, Any] = {
+        'echo': False,
+        'pool_pre_ping': _env_bool('RESOURCE_DB_POOL_PRE_PING', True),
+    }
+    # In-memory SQLite uses a single shared connection, not a sized pool
+    if not is_sqlite_memory(database_url):
+        options.update(
+            pool_size=_env_int('RESOURCE_DB_POOL_SIZE', 10),
+            max_overflow=_env_int('RESOURCE_DB_MAX_OVERFLOW', 20),
+            pool_timeout=_env_int('RESOURCE_DB_POOL_TIMEOUT', 30),
+            pool_recycle=_env_int('RESOURCE_DB_POOL_RECYCLE', 1800),
+        )
+    return options
+
+
+def configure_sqlite_pragmas(engine: Engine):
+    """Set SQLite pragmas on every new connection
+
+    WAL lets readers proceed while one writer commits, synchronous=NORMAL is
+    durable under WAL without an fsync per commit, and busy_timeout makes a
+    blocked writer wait instead of failing with "database is locked".
+
+    Environment:
+        RESOURCE_SQLITE_BUSY_TIMEOUT_MS: Lock wait in milliseconds (default 5000)
+        RESOURCE_SQLITE_MMAP_SIZE: Memory-mapped I/O size in bytes (default 256 MiB)
+    """
+    busy_timeout = _env_int('RESOURCE_SQLITE_BUSY_TIMEOUT_MS', 5000)
+    mmap_size = _env_int('RESOURCE_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout}')
+        cursor.execute(f'PRAGMA mmap_size={mmap_size}')
+        cursor.close()
+
+
+def begin_sqlite_write(connection: Connection):
+    """Take the SQLite write lock now (BEGIN IMMEDIATE) unless the connection's transaction holds it
+
+    pysqlite only opens a transaction right before the first INSERT, UPDATE
+    or DELETE, so reads ahead of it - including SELECT ... FOR UPDATE, which
+    SQLite ignores - run in autocommit and lock nothing. A transaction that
+    is already open has written, and so already holds the lock.
+    """
+    dbapi_connection = connection.connection.dbapi_connection
+    # The aiosqlite adapter wraps the aiosqlite connection
+    sqlite_connection = getattr(dbapi_connection, '_connection', dbapi_connection)
+    if not sqlite_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """Current connection pool usage of an engine"""
+    pool = engine.pool
+    metrics: Dict[str, Any] = {'pool': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        if hasattr(pool, name):
+            metrics[name] = getattr(pool, name)()
+    return metrics
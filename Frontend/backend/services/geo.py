@@ -0,0 +1,206 @@
+"""
+Geo helpers for Resource Management
+Distance calculation, bounding boxes and an in-process grid index over resource coordinates
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+from math import radians, degrees, cos, sin, asin, sqrt, floor
+import threading
+
+import numpy as np
+
+# Mean radius of Earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two points using Haversine formula"""
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * asin(sqrt(a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_km_batch(latitude: float, longitude: float, latitudes, longitudes) -> np.ndarray:
+    """Distances from one origin to many points in a single array operation"""
+    return haversine_km_matrix([latitude], [longitude], latitudes, longitudes)[0]
+
+
+def haversine_km_matrix(origin_latitudes, origin_longitudes, latitudes, longitudes) -> np.ndarray:
+    """Distances between many origins and many points
+
+    Returns:
+        Array of shape (len(origins), len(points))
+    """
+    lat1 = np.radians(np.asarray(origin_latitudes, dtype=np.float64))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(origin_longitudes, dtype=np.float64))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(longitudes, dtype=np.float64))[np.newaxis, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float
+) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """Get the lat/lon box enclosing a radius around a point
+
+    Returns:
+        (min_lat, max_lat, lon_ranges) - lon_ranges holds two ranges when the
+        box crosses the antimeridian and a single full range near the poles
+    """
+    delta_lat = degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+
+    # Near the poles every longitude is within reach
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    ratio = sin(radius_km / EARTH_RADIUS_KM) / cos(radians(latitude))
+    if ratio >= 1.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    delta_lon = degrees(asin(ratio))
+    min_lon = longitude - delta_lon
+    max_lon = longitude + delta_lon
+
+    if min_lon < -180.0:
+        return min_lat, max_lat, [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+
+class GeoGridIndex:
+    """In-process grid index over resource coordinates
+
+    Points are bucketed into fixed-size lat/lon cells, so a radius query only
+    visits the cells overlapping the query's bounding box and runs the exact
+    distance check on the points inside them.
+
+    The index is process-local: it is loaded from the database on first use,
+    kept current by the write paths of ResourceDatabaseService and records
+    the resources' change marker it was read at, so writes of other workers
+    are picked up once the marker moves.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.1):
+        self.cell_size_deg = cell_size_deg
+        self.is_loaded = False
+        self.marker: Any = None
+        # All indexed resources, including those without coordinates
+        self._resource_ids: Set[int] = set()
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    @property
+    def resource_count(self) -> int:
+        """Number of indexed resources, with or without coordinates"""
+        return len(self._resource_ids)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Get the cell key for a point"""
+        return (
+            int(floor(latitude / self.cell_size_deg)),
+            int(floor(longitude / self.cell_size_deg))
+        )
+
+    def load(self, points: Iterable[Tuple[int, Optional[float], Optional[float]]], marker: Any = None):
+        """Replace the index contents with the (resource_id, latitude, longitude) rows as of marker"""
+        with self._lock:
+            self._resource_ids.clear()
+            self._points.clear()
+            self._cells.clear()
+            for resource_id, latitude, longitude in points:
+                self._insert(resource_id, latitude, longitude)
+            self.marker = marker
+            self.is_loaded = True
+
+    def refresh(self, points: Iterable[Tuple[int, Optional[float], Optional[float]]], marker: Any = None):
+        """Upsert changed (resource_id, latitude, longitude) rows and move the index to marker"""
+        with self._lock:
+            for resource_id, latitude, longitude in points:
+                self._remove(resource_id)
+                self._insert(resource_id, latitude, longitude)
+            self.marker = marker
+
+    def upsert(self, resource_id: int, latitude: Optional[float], longitude: Optional[float]):
+        """Insert or move a resource"""
+        with self._lock:
+            self._remove(resource_id)
+            self._insert(resource_id, latitude, longitude)
+
+    def remove(self, resource_id: int):
+        """Remove a resource"""
+        with self._lock:
+            self._remove(resource_id)
+
+    def _insert(self, resource_id: int, latitude: Optional[float], longitude: Optional[float]):
+        self._resource_ids.add(resource_id)
+        if latitude is None or longitude is None:
+            return
+        self._points[resource_id] = (latitude, longitude)
+        self._cells[self._cell(latitude, longitude)].add(resource_id)
+
+    def _remove(self, resource_id: int):
+        self._resource_ids.discard(resource_id)
+        point = self._points.pop(resource_id, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(resource_id)
+            if not members:
+                del self._cells[cell]
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[int, float]]:
+        """Get (resource_id, distance_km) pairs within radius, nearest first"""
+        min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+
+        with self._lock:
+            min_row, _ = self._cell(min_lat, 0.0)
+            max_row, _ = self._cell(max_lat, 0.0)
+            col_ranges = [
+                (self._cell(0.0, min_lon)[1], self._cell(0.0, max_lon)[1])
+                for min_lon, max_lon in lon_ranges
+            ]
+            box_cells = (max_row - min_row + 1) * sum(hi - lo + 1 for lo, hi in col_ranges)
+
+            # Walk whichever is smaller: the cells in the box or the occupied cells
+            if box_cells <= len(self._cells):
+                cells = (
+                    self._cells.get((row, col), ())
+                    for row in range(min_row, max_row + 1)
+                    for lo, hi in col_ranges
+                    for col in range(lo, hi + 1)
+                )
+            else:
+                cells = (
+                    members for (row, col), members in self._cells.items()
+                    if min_row <= row <= max_row and any(lo <= col <= hi for lo, hi in col_ranges)
+                )
+
+            resource_ids = [resource_id for members in cells for resource_id in members]
+            points = np.array([self._points[resource_id] for resource_id in resource_ids], dtype=np.float64)
+
+        if not resource_ids:
+            return []
+
+        distances = haversine_km_batch(latitude, longitude, points[:, 0], points[:, 1])
+        within = np.flatnonzero(distances <= radius_km)
+        order = within[np.argsort(distances[within], kind='stable')]
+        return [(resource_ids[i], float(distances[i])) for i in order]
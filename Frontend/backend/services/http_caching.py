@@ -0,0 +1,30 @@
+"""
+HTTP conditional request helpers for Resource Management
+Strong ETags and Last-Modified values from cheap change markers
+"""
+
+from typing import Any, Optional
+from datetime import datetime, timezone
+from email.utils import format_datetime
+import hashlib
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the parts identifying a representation"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
@@ -0,0 +1,82 @@
+"""
+Resource matching for Resource Management
+Vectorized scoring of candidate resources against a resource request
+"""
+
+from typing import List, Optional, Set
+import json
+
+import numpy as np
+
+# Weight of each criterion in the overall match score
+MATCH_SCORE_WEIGHTS = {
+    'distance': 0.4,
+    'price': 0.3,
+    'coverage': 0.3,
+}
+
+# Distance at which the score halves when a request sets no max_distance_km
+DISTANCE_SCALE_KM = 50.0
+
+
+def parse_terms(value: Optional[str]) -> Set[str]:
+    """Parse a JSON array column (skills, equipment) into a set"""
+    if not value:
+        return set()
+    try:
+        return set(json.loads(value))
+    except (ValueError, TypeError):
+        return set()
+
+
+def distance_scores(distances: Optional[np.ndarray], count: int, max_distance_km: Optional[float]) -> np.ndarray:
+    """Score distances from 1 at the request location down to 0
+
+    Falls linearly to 0 at max_distance_km, or halves every DISTANCE_SCALE_KM
+    without one. Unknown distances score 0; without a request location every
+    candidate scores 1.
+    """
+    if distances is None:
+        return np.ones(count)
+    if max_distance_km:
+        scores = 1.0 - distances / max_distance_km
+    else:
+        scores = 1.0 / (1.0 + distances / DISTANCE_SCALE_KM)
+    return np.nan_to_num(np.clip(scores, 0.0, 1.0), nan=0.0)
+
+
+def price_scores(hourly_rates: np.ndarray, max_hourly_rate: Optional[float]) -> np.ndarray:
+    """Score hourly rates from 1 for the cheapest candidate down to 0
+
+    Rates are scaled between the cheapest candidate and max_hourly_rate (or
+    the most expensive candidate). Unknown rates score 0.
+    """
+    known = ~np.isnan(hourly_rates)
+    if not known.any():
+        return np.zeros(len(hourly_rates))
+    floor = hourly_rates[known].min()
+    ceiling = float(max_hourly_rate) if max_hourly_rate else hourly_rates[known].max()
+    if ceiling <= floor:
+        return known.astype(np.float64)
+    scores = (ceiling - hourly_rates) / (ceiling - floor)
+    return np.nan_to_num(np.clip(scores, 0.0, 1.0), nan=0.0)
+
+
+def match_scores(distance: np.ndarray, price: np.ndarray, coverage: np.ndarray) -> np.ndarray:
+    """Combine per-criterion scores into the weighted match score (0 to 1)"""
+    return (
+        MATCH_SCORE_WEIGHTS['distance'] * distance
+        + MATCH_SCORE_WEIGHTS['price'] * price
+        + MATCH_SCORE_WEIGHTS['coverage'] * coverage
+    )
+
+
+def top_k(scores: np.ndarray, k: int) -> List[int]:
+    """Indices of the k best scores, best first"""
+    if k <= 0 or not len(scores):
+        return []
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))].tolist()
@@ -0,0 +1,44 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque tokens encoding the (sort_key, id) of the last row of a page
+"""
+
+from typing import Any, List, Optional, Tuple, Union
+from datetime import date
+import base64
+import json
+
+
+def encode_cursor(sort_value: Union[date, str], row_id: int) -> str:
+    """Encode the position after a row as an opaque cursor token
+
+    sort_value may also be an ISO date string, as in rows read back from a JSON cache.
+    """
+    if isinstance(sort_value, date):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Decode a cursor token
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def next_cursor(items: List[Any], limit: Optional[int], sort_attribute: str) -> Optional[str]:
+    """Get the cursor for the page after items, or None on the last page"""
+    if not limit or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last[sort_attribute], last['id'])
+    return encode_cursor(getattr(last, sort_attribute), last.id)
@@ -0,0 +1,77 @@
+"""
+Read replica routing for Resource Management
+Round-robin over healthy replicas, with a background health check
+"""
+
+from typing import List, Optional
+import logging
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """Chooses a healthy read replica per read-only session
+    
+    Replicas are identified by their position in the engine list, so an
+    async service can route its own engines by the same index. A daemon
+    thread runs SELECT 1 on every replica on start and every
+    check_interval seconds; unhealthy replicas are skipped until a check
+    succeeds again.
+    """
+    
+    def __init__(self, engines: List[Engine], check_interval: float = 10.0):
+        self.engines = engines
+        self.check_interval = check_interval
+        self._healthy = [True] * len(engines)
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def choose(self) -> Optional[int]:
+        """Get the index of the next healthy replica, or None to use the primary"""
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = self._next
+                self._next = (self._next + 1) % len(self.engines)
+                if self._healthy[index]:
+                    return index
+        return None
+    
+    def mark_unhealthy(self, index: int):
+        """Skip a replica until the next successful health check"""
+        with self._lock:
+            self._healthy[index] = False
+    
+    def check_health(self):
+        """Check every replica once"""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
+                healthy = True
+            except Exception as e:
+                logger.warning(f"Read replica {index} failed health check: {e}")
+                healthy = False
+            with self._lock:
+                self._healthy[index] = healthy
+    
+    def start(self):
+        """Start the background health check"""
+        if self._thread is None and self.engines:
+            self._thread = threading.Thread(target=self._run, name='replica-health-check', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop the background health check"""
+        self._stopped.set()
+    
+    def _run(self):
+        while True:
+            self.check_health()
+            if self._stopped.wait(self.check_interval):
+                return
@@ -0,0 +1,45 @@
+"""
+Serializers for Resource Management
+Plain-dict snapshots of ORM objects, suitable for caching, and fast JSON encoding
+"""
+
+from typing import Any, Dict
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+import json
+
+from sqlalchemy import inspect
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def model_to_dict(instance) -> Dict[str, Any]:
+    """Column values of an ORM instance, keyed by attribute name"""
+    return {
+        attribute.key: getattr(instance, attribute.key)
+        for attribute in inspect(instance).mapper.column_attrs
+    }
+
+
+def json_default(value: Any, decimals_as_strings: bool = True) -> Any:
+    """Convert dates, datetimes and decimals the way Pydantic's JSON output does
+
+    Decimals become strings, or numbers when decimals_as_strings is False.
+    """
+    if isinstance(value, Decimal):
+        return str(value) if decimals_as_strings else float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(value: Any, decimals_as_strings: bool = True) -> bytes:
+    """Encode value as compact UTF-8 JSON, with orjson when it is installed"""
+    default = partial(json_default, decimals_as_strings=decimals_as_strings)
+    if orjson is not None:
+        return orjson.dumps(value, default=default)
+    return json.dumps(value, default=default, ensure_ascii=False, separators=(',', ':')).encode()
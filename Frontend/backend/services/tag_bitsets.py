@@ -0,0 +1,146 @@
+"""
+Tag bitsets for Resource Management
+Skills and equipment interned into a vocabulary and held per resource as bitsets
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+
+import numpy as np
+
+# A tag key is (kind, tag), e.g. ('skill', 'Schweißen') or ('equipment', 'Kran')
+TagKey = Tuple[str, str]
+
+# Bits per bitset word
+WORD_BITS = 64
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Count set bits per element of a uint64 array"""
+        return np.bitwise_count(words)
+else:
+    _BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Count set bits per element of a uint64 array"""
+        counts = _BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)]
+        return counts.reshape(words.shape + (8,)).sum(axis=-1)
+
+
+class TagVocabulary:
+    """Interns tag keys into consecutive bit positions"""
+
+    def __init__(self):
+        self._bits: Dict[TagKey, int] = {}
+
+    def intern(self, key: TagKey) -> int:
+        """Get the bit of a tag key, assigning the next free bit to new keys"""
+        bit = self._bits.get(key)
+        if bit is None:
+            bit = self._bits[key] = len(self._bits)
+        return bit
+
+    def get(self, key: TagKey) -> Optional[int]:
+        """Get the bit of a tag key, or None if it was never interned"""
+        return self._bits.get(key)
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+
+class TagBitsetIndex:
+    """Process-local tag bitset per resource
+
+    Bitsets live in one (rows, words) uint64 matrix so coverage of many
+    candidates is a gather, a bitwise AND and a popcount. Row 0 stays empty
+    and stands in for resources without tags. Each resource records the
+    version (its updated_at) its tags were read at; ResourceDatabaseService
+    reloads missing or outdated candidates from resource_tags before
+    scoring, so writes by other workers are picked up.
+    """
+
+    def __init__(self):
+        self.vocabulary = TagVocabulary()
+        self._rows: Dict[int, int] = {}
+        self._versions: Dict[int, Any] = {}
+        self._free_rows = []
+        self._bits = np.zeros((1, 1), dtype=np.uint64)
+        self._row_count = 1
+        self._lock = threading.RLock()
+
+    def upsert(self, resource_id: int, keys: Iterable[TagKey], version: Any = None):
+        """Set a resource's tags as of version"""
+        with self._lock:
+            self._set(resource_id, list(keys))
+            self._versions[resource_id] = version
+
+    def remove(self, resource_id: int):
+        """Drop a resource from the index"""
+        with self._lock:
+            self._versions.pop(resource_id, None)
+            row = self._rows.pop(resource_id, None)
+            if row is not None:
+                self._bits[row] = 0
+                self._free_rows.append(row)
+
+    def stale(self, versions: Dict[int, Any]) -> List[int]:
+        """Resources of {resource_id: version} that are missing or indexed at another version"""
+        with self._lock:
+            indexed = self._versions
+            return [
+                resource_id for resource_id, version in versions.items()
+                if resource_id not in indexed or indexed[resource_id] != version
+            ]
+
+    def coverage(self, resource_ids: Sequence[int], keys: Iterable[TagKey]) -> np.ndarray:
+        """Share of the tag keys each resource has (1 when no keys are given)"""
+        keys = set(keys)
+        if not keys:
+            return np.ones(len(resource_ids))
+        with self._lock:
+            mask = self._mask(keys)
+            bits = self._bits[self._gather(resource_ids)]
+        return popcount(bits & mask).sum(axis=1, dtype=np.int64) / len(keys)
+
+    def _set(self, resource_id: int, keys: list):
+        bits = [self.vocabulary.intern(key) for key in keys]
+        words = max(self._bits.shape[1], -(-len(self.vocabulary) // WORD_BITS))
+
+        row = self._rows.get(resource_id)
+        if row is None:
+            row = self._free_rows.pop() if self._free_rows else self._next_row()
+            self._rows[resource_id] = row
+
+        if words > self._bits.shape[1] or row >= self._bits.shape[0]:
+            rows = max(self._bits.shape[0], 1)
+            while rows <= row:
+                rows *= 2
+            grown = np.zeros((rows, words), dtype=np.uint64)
+            grown[:self._bits.shape[0], :self._bits.shape[1]] = self._bits
+            self._bits = grown
+
+        self._bits[row] = 0
+        for bit in bits:
+            self._bits[row, bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+
+    def _next_row(self) -> int:
+        row = self._row_count
+        self._row_count += 1
+        return row
+
+    def _mask(self, keys: Iterable[TagKey]) -> np.ndarray:
+        """Bitset of the keys; keys never interned are held by no resource and set no bit"""
+        mask = np.zeros(self._bits.shape[1], dtype=np.uint64)
+        for key in keys:
+            bit = self.vocabulary.get(key)
+            if bit is not None:
+                mask[bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+        return mask
+
+    def _gather(self, resource_ids: Sequence[int]) -> np.ndarray:
+        """Matrix rows of resources, row 0 for resources without tags"""
+        rows = self._rows
+        return np.fromiter(
+            (rows.get(resource_id, 0) for resource_id in resource_ids),
+            dtype=np.int64, count=len(resource_ids)
+        )
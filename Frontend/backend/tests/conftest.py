@@ -0,0 +1,104 @@
+"""
+Shared fixtures for the Resource Management backend tests
+Every test gets its own temporary SQLite database
+"""
+
+from datetime import date
+import os
+import sys
+
+import pytest
+
+# The backend is imported as the "backend" package from the Frontend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.resource_db_service import ResourceDatabaseService
+
+# PostgreSQL database with the PostGIS extension available, for the postgis tests
+POSTGIS_URL_ENV = 'RESOURCE_TEST_POSTGIS_URL'
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', f'postgis: needs a PostGIS database in {POSTGIS_URL_ENV}; its resource tables are dropped'
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv(POSTGIS_URL_ENV):
+        return
+    skip = pytest.mark.skip(reason=f'{POSTGIS_URL_ENV} is not set')
+    for item in items:
+        if 'postgis' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    """Test client for the resources router on a fresh SQLite file"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend import resources_api
+
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'api.db'}")
+    monkeypatch.setattr(resources_api, '_db_service', None)
+    app = FastAPI()
+    app.include_router(resources_api.router)
+    # One client session keeps the async engine on a single event loop
+    with TestClient(app) as client:
+        yield client
+        service = resources_api._db_service
+        if service is not None:
+            client.portal.call(service.engine.dispose)
+            service.service.replicas.stop()
+            service.service.engine.dispose()
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    """Resource database service on a fresh SQLite file"""
+    service = ResourceDatabaseService(f"sqlite:///{tmp_path / 'resources.db'}")
+    yield service
+    service.replicas.stop()
+    service.engine.dispose()
+
+
+@pytest.fixture
+def session(db_service):
+    """Session on the test database"""
+    session = db_service.get_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_resource(db_service, session):
+    """Create a resource, defaulting everything but the overrides"""
+    def make(provider_id=1, **overrides):
+        data = {
+            'start_date': date(2024, 1, 1),
+            'end_date': date(2024, 1, 31),
+            'person_count': 4,
+            'category': 'Bau',
+            'hourly_rate': 50,
+        }
+        data.update(overrides)
+        return db_service.create_resource(session, data, provider_id)
+    return make
+
+
+@pytest.fixture
+def make_allocation(db_service, session):
+    """Create an allocation on a resource, defaulting everything but the overrides"""
+    def make(resource, **overrides):
+        data = {
+            'resource_id': resource.id,
+            'trade_id': 1,
+            'allocated_person_count': 1,
+            'allocated_start_date': resource.start_date,
+            'allocated_end_date': resource.end_date,
+        }
+        data.update(overrides)
+        return db_service.create_allocation(session, data, 1)
+    return make
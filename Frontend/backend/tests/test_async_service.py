@@ -0,0 +1,91 @@
+"""
+Async service: streaming exports and run_sync delegation on aiosqlite
+"""
+
+from datetime import date
+import asyncio
+
+import pytest
+
+from backend.models.resource_models import ResourceCalendarEntry
+from backend.services.async_resource_db_service import AsyncResourceDatabaseService
+from backend.services.resource_db_service import ResourceDatabaseService
+
+
+@pytest.fixture
+def async_service(db_service):
+    service = AsyncResourceDatabaseService(db_service, str(db_service.engine.url))
+    yield service
+    asyncio.run(service.engine.dispose())
+
+
+def run(async_service, method):
+    """Run method(session) on a fresh async session"""
+    async def main():
+        async with async_service.get_session() as session:
+            return await method(session)
+    return asyncio.run(main())
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+def test_stream_resources_matches_list(async_service, db_service, session, make_resource):
+    for day in (3, 1, 2, 1):
+        make_resource(start_date=date(2024, 1, day), category='Bau' if day != 2 else 'Elektro')
+    make_resource(provider_id=2)
+
+    streamed = run(async_service, lambda async_session: collect(
+        async_service.stream_resources(async_session, {'category': 'Bau'}, ['id', 'start_date'], chunk_size=2)
+    ))
+
+    listed = db_service.list_resources(session, {'category': 'Bau'}, limit=100)
+    assert [row['id'] for row in streamed] == [resource.id for resource in listed]
+    assert list(streamed[0]) == ['id', 'start_date']
+
+
+def test_stream_calendar_entries_matches_get(async_service, db_service, session, make_resource, make_allocation):
+    resource = make_resource(start_date=date(2024, 1, 1), end_date=date(2024, 1, 10))
+    make_allocation(resource, allocated_start_date=date(2024, 1, 4), allocated_end_date=date(2024, 1, 6))
+    make_resource(start_date=date(2024, 1, 5), end_date=date(2024, 1, 20))
+    session.add(ResourceCalendarEntry(service_provider_id=1, entry_date=date(2024, 1, 8), person_count=0))
+    session.commit()
+
+    streamed = run(async_service, lambda async_session: collect(
+        async_service.stream_calendar_entries(async_session, 1, date(2024, 1, 3), date(2024, 1, 12), chunk_size=1)
+    ))
+
+    expected = db_service.get_calendar_entries(session, 1, date(2024, 1, 3), date(2024, 1, 12))
+    key = lambda entry: (entry['entry_date'], entry['resource_id'] or 0)
+    assert sorted(streamed, key=key) == sorted(expected, key=key)
+    # Grouped by resource, provider-level entries last
+    assert [entry['resource_id'] for entry in streamed] == sorted(
+        (entry['resource_id'] for entry in expected), key=lambda resource_id: resource_id or float('inf')
+    )
+
+
+def test_geo_index_loads_through_the_async_session(tmp_path, monkeypatch):
+    db_service = ResourceDatabaseService(f"sqlite:///{tmp_path / 'geo.db'}", use_geo_index=True)
+    async_service = AsyncResourceDatabaseService(db_service, str(db_service.engine.url))
+    try:
+        with db_service.get_session() as session:
+            for latitude in (52.52, 52.6, 48.14):
+                db_service.create_resource(session, {
+                    'start_date': date(2024, 1, 1), 'end_date': date(2024, 1, 31), 'person_count': 1,
+                    'category': 'Bau', 'latitude': latitude, 'longitude': 13.40
+                }, 1)
+        db_service.geo_index.is_loaded = False
+
+        # The sync session factory blocks the event loop and must not be used
+        monkeypatch.setattr(db_service, 'SessionLocal', None)
+        found = run(async_service, lambda async_session: async_service.search_resources_geo(
+            async_session, 52.52, 13.40, 20
+        ))
+
+        assert db_service.geo_index.is_loaded
+        assert [resource.latitude for resource in found] == [52.52, 52.6]
+    finally:
+        asyncio.run(async_service.engine.dispose())
+        db_service.replicas.stop()
+        db_service.engine.dispose()
@@ -0,0 +1,86 @@
+"""
+The availability matrix against brute-force day counts
+"""
+
+from datetime import date, timedelta
+import random
+
+import numpy as np
+
+from backend.models.resource_models import ResourceRequest
+from backend.services import resource_db_service
+from backend.services.availability import free_persons_matrix
+
+ORIGIN = date(2024, 1, 1)
+
+
+def random_interval(rng, first_day, last_day):
+    start = rng.randint(first_day, last_day)
+    end = rng.randint(start, min(last_day, start + 20))
+    return ORIGIN + timedelta(days=start), ORIGIN + timedelta(days=end)
+
+
+def booked_on(bookings, day):
+    return sum(persons for start, end, persons in bookings if start <= day <= end)
+
+
+def test_free_persons_matrix_matches_brute_force():
+    rng = random.Random(11)
+    start_date, end_date = ORIGIN + timedelta(days=10), ORIGIN + timedelta(days=45)
+    resources = []
+    for resource_id in range(1, 31):
+        start, end = random_interval(rng, 0, 60)
+        resources.append((resource_id, start, end, rng.randint(1, 6)))
+    bookings = []
+    for _ in range(80):
+        start, end = random_interval(rng, 0, 60)
+        bookings.append((rng.randint(1, 35), start, end, rng.randint(1, 3)))
+
+    resource_ids, matrix = free_persons_matrix(start_date, end_date, resources, bookings)
+
+    assert resource_ids == [resource[0] for resource in resources]
+    assert matrix.shape == (len(resources), (end_date - start_date).days + 1)
+    for row, (resource_id, start, end, person_count) in enumerate(resources):
+        resource_bookings = [booking[1:] for booking in bookings if booking[0] == resource_id]
+        expected = [
+            max((person_count if start <= day <= end else 0) - booked_on(resource_bookings, day), 0)
+            for day in (start_date + timedelta(days=offset) for offset in range(matrix.shape[1]))
+        ]
+        np.testing.assert_array_equal(matrix[row], expected)
+
+
+def test_free_persons_matrix_without_resources():
+    resource_ids, matrix = free_persons_matrix(ORIGIN, ORIGIN + timedelta(days=6), [], [(1, ORIGIN, ORIGIN, 1)])
+
+    assert resource_ids == []
+    assert matrix.shape == (0, 7)
+
+
+def test_matching_keeps_resources_free_on_every_day(db_service, session, make_resource, make_allocation, monkeypatch):
+    monkeypatch.setattr(resource_db_service, 'MATCH_AVAILABILITY_CHUNK_SIZE', 2)
+    rng = random.Random(5)
+    window_start, window_end = date(2024, 1, 10), date(2024, 1, 20)
+    expected = []
+    for _ in range(12):
+        resource = make_resource(person_count=4)
+        bookings = []
+        for _ in range(rng.randint(0, 4)):
+            start, end = random_interval(rng, 0, 30)
+            persons = rng.randint(1, 3)
+            try:
+                make_allocation(resource, allocated_start_date=start, allocated_end_date=end,
+                                allocated_person_count=persons, allocation_status='accepted')
+            except ValueError:
+                continue
+            bookings.append((start, end, persons))
+        days = [window_start + timedelta(days=offset) for offset in range((window_end - window_start).days + 1)]
+        if all(4 - booked_on(bookings, day) >= 2 for day in days):
+            expected.append(resource.id)
+
+    request = ResourceRequest(
+        trade_id=1, requested_by=1, category='Bau', required_person_count=2,
+        required_start_date=window_start, required_end_date=window_end
+    )
+    matched = db_service.match_resources_for_request(session, request, limit=100)
+
+    assert sorted(resource.id for resource in matched) == expected
@@ -0,0 +1,108 @@
+"""
+Bulk allocation batches: committed together or not at all
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from backend.models.resource_models import (
+    Resource, ResourceAllocation, ResourceCalendarInterval, ResourceKPIRollup
+)
+
+
+def booking(resource, persons, first_day, last_day, trade_id=1, status='accepted'):
+    return {
+        'resource_id': resource.id,
+        'trade_id': trade_id,
+        'allocated_person_count': persons,
+        'allocated_start_date': date(2024, 1, first_day),
+        'allocated_end_date': date(2024, 1, last_day),
+        'allocation_status': status,
+        'total_cost': 100 * persons,
+    }
+
+
+def snapshot(session):
+    """Everything a bulk batch writes: allocations, calendar overlays, KPI rollups and resource states"""
+    session.expire_all()
+    return (
+        sorted(
+            (row.resource_id, row.trade_id, row.allocated_start_date, row.allocated_person_count)
+            for row in session.query(ResourceAllocation)
+        ),
+        sorted(
+            (row.resource_id, row.allocation_id or 0, row.start_date, row.end_date, row.status)
+            for row in session.query(ResourceCalendarInterval)
+        ),
+        sorted(
+            (row.service_provider_id, row.bucket_date, row.metric, row.start_value, row.end_value,
+             row.cumulative_start, row.cumulative_end, row.cumulative_days)
+            for row in session.query(ResourceKPIRollup)
+        ),
+        sorted((row.id, row.status) for row in session.query(Resource)),
+    )
+
+
+@pytest.fixture
+def resources(make_resource, make_allocation):
+    first = make_resource(person_count=2)
+    second = make_resource(provider_id=2, person_count=3)
+    make_allocation(first, allocated_start_date=date(2024, 1, 20), allocated_end_date=date(2024, 1, 22))
+    return first, second
+
+
+@pytest.mark.parametrize('invalid', ['missing_resource', 'over_capacity', 'conflict_within_batch'])
+def test_invalid_item_creates_nothing(db_service, session, resources, invalid):
+    first, second = resources
+    batch = [booking(first, 1, 2, 4), booking(second, 2, 5, 9, trade_id=2), booking(first, 1, 10, 12)]
+    if invalid == 'missing_resource':
+        batch.append({**booking(first, 1, 2, 3), 'resource_id': 999})
+    elif invalid == 'over_capacity':
+        batch.append(booking(second, 4, 15, 16))
+    else:
+        batch.append(booking(first, 2, 3, 3))
+    before = snapshot(session)
+
+    with pytest.raises(ValueError):
+        db_service.bulk_create_allocations(session, batch, 1)
+
+    assert snapshot(session) == before
+
+
+def test_failure_after_flush_rolls_back_the_batch(db_service, session, resources, monkeypatch):
+    first, second = resources
+    before = snapshot(session)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('rollup failed')
+    monkeypatch.setattr(db_service, '_apply_kpi_rollups', fail)
+
+    with pytest.raises(RuntimeError):
+        db_service.bulk_create_allocations(session, [booking(first, 1, 2, 4), booking(second, 2, 5, 9)], 1)
+
+    assert snapshot(session) == before
+
+
+def test_valid_batch_commits_all_items_once(db_service, session, resources):
+    first, second = resources
+    batch = [booking(first, 1, 2, 4), booking(first, 1, 2, 4), booking(second, 3, 5, 9, trade_id=2)]
+    commits = []
+    event.listen(session, 'after_commit', commits.append)
+
+    created = db_service.bulk_create_allocations(session, batch, 1)
+
+    assert len(commits) == 1
+    assert len(created) == 3 and all(allocation.id for allocation in created)
+    allocations, intervals, _, states = snapshot(session)
+    assert len(allocations) == 4
+    overlays = [interval for interval in intervals if interval[1] in {allocation.id for allocation in created}]
+    assert len(overlays) == 3
+    assert states == [(first.id, 'allocated'), (second.id, 'allocated')]
+
+    # The committed batch fills both resources on those days
+    with pytest.raises(ValueError):
+        db_service.bulk_create_allocations(session, [booking(first, 1, 3, 3)], 1)
+    with pytest.raises(ValueError):
+        db_service.create_allocation(session, booking(second, 1, 7, 7), 1)
@@ -0,0 +1,134 @@
+"""
+Read caches: TTL/LRU behaviour, Redis version tokens and what may fill them
+"""
+
+import fnmatch
+import time
+
+from backend.services import cache as cache_module
+from backend.services.cache import RedisCache, TTLCache
+from backend.services.resource_db_service import ResourceDatabaseService
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.Redis calls RedisCache makes"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        if value is None:
+            return None
+        payload, expires_at = value
+        if expires_at <= time.monotonic():
+            del self.values[key]
+            return None
+        return payload
+
+    def set(self, key, payload, px):
+        self.values[key] = (payload, time.monotonic() + px / 1000)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values) if fnmatch.fnmatch(key, match)]
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    cache = TTLCache(ttl_seconds=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl_seconds=30)
+
+    now[0] = 109.9
+    assert cache.get('a') == 1
+    now[0] = 110.0
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    now[0] = 130.0
+    assert cache.get('b', 'gone') == 'gone'
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+    cache.delete('a', 'missing')
+    cache.clear()
+    assert cache.get('c') is None
+
+
+def test_redis_version_tokens_invalidate_pages_across_workers(db_service, session, make_resource):
+    client = FakeRedis()
+    url = str(db_service.engine.url)
+    workers = [ResourceDatabaseService(url, read_cache=RedisCache(client, 30)) for _ in range(2)]
+    try:
+        resource = make_resource(person_count=2)
+        reader, writer = workers
+        with reader.get_session() as reader_session, writer.get_session() as writer_session:
+            page, digest = reader.list_provider_resources_cached(reader_session, 1)
+            assert [row['person_count'] for row in page] == [2]
+            assert client.get('resources:provider_resources_version:1') is not None
+
+            # The writer drops the shared token, so the reader's page key changes
+            version = client.get('resources:provider_resources_version:1')
+            writer.update_resource(writer_session, resource.id, {'person_count': 3})
+            assert client.get('resources:provider_resources_version:1') is None
+
+            reader_session.expire_all()
+            page, new_digest = reader.list_provider_resources_cached(reader_session, 1)
+            assert [row['person_count'] for row in page] == [3]
+            assert new_digest != digest
+            assert client.get('resources:provider_resources_version:1') not in (None, version)
+    finally:
+        for worker in workers:
+            worker.replicas.stop()
+            worker.engine.dispose()
+
+
+def test_entries_follow_the_change_marker(db_service, session, make_resource, make_allocation):
+    resource = make_resource(person_count=2)
+    allocation = make_allocation(resource)
+    assert db_service.get_resource_cached(session, resource.id)['person_count'] == 2
+    assert [row['id'] for row in db_service.get_allocations_by_trade_cached(session, 1)] == [allocation.id]
+
+    # Written by another worker, whose writes do not reach this worker's cache
+    other_worker = type(db_service)(str(db_service.engine.url))
+    try:
+        with other_worker.get_session() as other_session:
+            other_worker.update_resource(other_session, resource.id, {'person_count': 3})
+            other_worker.update_allocation_status(other_session, allocation.id, 'invited')
+    finally:
+        other_worker.replicas.stop()
+        other_worker.engine.dispose()
+    session.expire_all()
+
+    assert db_service.get_resource_cached(session, resource.id)['person_count'] == 3
+    assert [row['allocation_status'] for row in db_service.get_allocations_by_trade_cached(session, 1)] == ['invited']
+    resources, _ = db_service.list_provider_resources_cached(session, 1)
+    assert [row['person_count'] for row in resources] == [3]
+
+
+def test_replica_reads_do_not_fill_the_cache(db_service, session, make_resource):
+    resource = make_resource()
+    session.info['replica'] = 0
+
+    assert db_service.get_resource_cached(session, resource.id)['id'] == resource.id
+    db_service.list_provider_resources_cached(session, 1)
+    db_service.get_allocations_by_trade_cached(session, 1)
+    assert len(db_service.read_cache._entries) == 2
+    assert all(key[0].endswith('_version') for key in db_service.read_cache._entries)
+
+    del session.info['replica']
+    db_service.get_resource_cached(session, resource.id)
+    assert any(key[0] == 'resource' for key in db_service.read_cache._entries)
@@ -0,0 +1,142 @@
+"""
+Calendar interval expansion against the allocations covering each day
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from backend.models.resource_models import ResourceCalendarEntry
+from backend.services.resource_db_service import ALLOCATION_CALENDAR_STATUS, CALENDAR_STATUS_PRECEDENCE
+
+
+def expected_days(resource, allocations, start_date, end_date):
+    """Brute force: {day: (status, candidate allocation ids)} for one resource"""
+    days = {}
+    day = max(resource.start_date, start_date)
+    while day <= min(resource.end_date, end_date):
+        covering = [
+            (CALENDAR_STATUS_PRECEDENCE[ALLOCATION_CALENDAR_STATUS[allocation.allocation_status]], allocation.id)
+            for allocation in allocations
+            if allocation.allocation_status in ALLOCATION_CALENDAR_STATUS
+            and allocation.allocated_start_date <= day <= allocation.allocated_end_date
+        ]
+        if covering:
+            precedence = max(covering)[0]
+            status = next(name for name, value in CALENDAR_STATUS_PRECEDENCE.items() if value == precedence)
+            days[day] = (status, {allocation_id for value, allocation_id in covering if value == precedence})
+        else:
+            days[day] = ('available', {None})
+        day += timedelta(days=1)
+    return days
+
+
+def assert_calendar_matches(db_service, session, provider_id, start_date, end_date):
+    entries = db_service.get_calendar_entries(session, provider_id, start_date, end_date)
+    resources = [resource for resource in db_service.list_resources(session, limit=100)
+                 if resource.service_provider_id == provider_id]
+
+    expected = {}
+    for resource in resources:
+        session.refresh(resource)
+        for day, value in expected_days(resource, resource.allocations, start_date, end_date).items():
+            expected[(resource.id, day)] = value
+
+    actual = {(entry['resource_id'], entry['entry_date']): entry for entry in entries}
+    assert len(actual) == len(entries)
+    assert actual.keys() == expected.keys()
+    for key, (status, allocation_ids) in expected.items():
+        assert actual[key]['status'] == status, key
+        assert actual[key]['allocation_id'] in allocation_ids, key
+
+
+def test_calendar_follows_allocation_writes(db_service, session, make_resource, make_allocation):
+    resource = make_resource(person_count=5)
+    other = make_resource(start_date=date(2024, 1, 20), end_date=date(2024, 2, 10))
+    tentative = make_allocation(resource, allocated_start_date=date(2024, 1, 3), allocated_end_date=date(2024, 1, 12))
+    make_allocation(resource, allocated_start_date=date(2024, 1, 8), allocated_end_date=date(2024, 1, 9),
+                    allocation_status='accepted')
+    rejected = make_allocation(other, allocated_start_date=date(2024, 1, 25), allocated_end_date=date(2024, 1, 28))
+    make_allocation(other, allocated_start_date=date(2024, 2, 1), allocated_end_date=date(2024, 2, 3),
+                    allocation_status='invited')
+
+    assert_calendar_matches(db_service, session, 1, date(2023, 12, 25), date(2024, 2, 15))
+
+    db_service.update_allocation_status(session, tentative.id, 'confirmed')
+    db_service.update_allocation_status(session, rejected.id, 'rejected')
+
+    assert_calendar_matches(db_service, session, 1, date(2023, 12, 25), date(2024, 2, 15))
+    assert_calendar_matches(db_service, session, 1, date(2024, 1, 9), date(2024, 1, 26))
+
+
+def test_calendar_follows_allocation_lifecycle(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    allocation = make_allocation(resource, allocated_start_date=date(2024, 1, 5), allocated_end_date=date(2024, 1, 6))
+
+    def statuses():
+        entries = db_service.get_calendar_entries(session, 1, date(2024, 1, 5), date(2024, 1, 6))
+        return {(entry['status'], entry['allocation_id']) for entry in entries}
+
+    assert statuses() == {('tentative', allocation.id)}
+    for status, calendar_status in [
+        ('invited', 'tentative'),
+        ('offer_submitted', 'tentative'),
+        ('accepted', 'allocated'),
+        ('completed', 'allocated'),
+        # Statuses without a mapping keep the overlay
+        ('on_hold', 'allocated'),
+    ]:
+        db_service.update_allocation_status(session, allocation.id, status)
+        assert statuses() == {(calendar_status, allocation.id)}, status
+
+    db_service.update_allocation_status(session, allocation.id, 'cancelled')
+    assert statuses() == {('available', None)}
+
+
+def test_calendar_includes_provider_level_entries(db_service, session, make_resource):
+    resource = make_resource(start_date=date(2024, 1, 1), end_date=date(2024, 1, 3))
+    session.add_all([
+        ResourceCalendarEntry(service_provider_id=1, entry_date=date(2024, 1, 2), person_count=0,
+                              status='blocked', label='Betriebsurlaub'),
+        ResourceCalendarEntry(service_provider_id=1, entry_date=date(2024, 1, 9), person_count=0),
+        ResourceCalendarEntry(service_provider_id=2, entry_date=date(2024, 1, 2), person_count=0),
+    ])
+    session.commit()
+
+    entries = db_service.get_calendar_entries(session, 1, date(2024, 1, 1), date(2024, 1, 3))
+
+    assert [(entry['entry_date'].day, entry['resource_id']) for entry in entries] == [
+        (1, resource.id), (2, None), (2, resource.id), (3, resource.id)
+    ]
+    assert entries[1]['status'] == 'blocked'
+    assert entries[1]['label'] == 'Betriebsurlaub'
+
+
+def test_calendar_follows_resource_updates(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    make_allocation(resource, allocated_start_date=date(2024, 1, 28), allocated_end_date=date(2024, 1, 30))
+
+    db_service.update_resource(session, resource.id, {'start_date': date(2024, 1, 15), 'end_date': date(2024, 2, 5)})
+
+    assert_calendar_matches(db_service, session, 1, date(2024, 1, 1), date(2024, 2, 28))
+
+
+def test_expand_calendar_intervals_paints_overlays_by_precedence(db_service):
+    def interval(interval_id, allocation_id, start_day, end_day, status):
+        return SimpleNamespace(
+            id=interval_id, resource_id=1, allocation_id=allocation_id, service_provider_id=1,
+            start_date=date(2024, 1, start_day), end_date=date(2024, 1, end_day), person_count=2,
+            hours_allocated=8.0, status=status, color='#000000', label='Bau - 2 Personen'
+        )
+
+    intervals = [
+        interval(1, None, 1, 10, 'available'),
+        interval(2, 7, 2, 6, 'allocated'),
+        interval(3, 8, 4, 8, 'tentative'),
+    ]
+
+    entries = db_service.expand_calendar_intervals(intervals, date(2024, 1, 3), date(2024, 1, 9))
+
+    assert [(entry['entry_date'].day, entry['status'], entry['allocation_id']) for entry in entries] == [
+        (3, 'allocated', 7), (4, 'allocated', 7), (5, 'allocated', 7), (6, 'allocated', 7),
+        (7, 'tentative', 8), (8, 'tentative', 8), (9, 'available', None),
+    ]
@@ -0,0 +1,167 @@
+"""
+Capacity timelines against brute-force day counts
+"""
+
+from datetime import date, timedelta
+import random
+import threading
+
+import pytest
+from sqlalchemy import func
+
+from backend.models.resource_models import ResourceAllocation
+from backend.services.capacity_timeline import CapacityTimeline, CapacityTimelineIndex
+
+ORIGIN = date(2024, 1, 1)
+
+
+def random_interval(rng, first_day, last_day):
+    start = rng.randint(first_day, last_day)
+    end = rng.randint(start, min(last_day, start + 20))
+    return ORIGIN + timedelta(days=start), ORIGIN + timedelta(days=end)
+
+
+def booked_on(bookings, day):
+    return sum(persons for start, end, persons in bookings if start <= day <= end)
+
+
+def test_timeline_peak_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        timeline_start, timeline_end = ORIGIN, ORIGIN + timedelta(days=rng.randint(0, 60))
+        timeline = CapacityTimeline(timeline_start, timeline_end)
+        bookings = []
+        for _ in range(rng.randint(0, 15)):
+            start, end = random_interval(rng, -5, 65)
+            persons = rng.randint(1, 4)
+            timeline.add(start, end, persons)
+            bookings.append((start, end, persons))
+
+        for _ in range(20):
+            start, end = random_interval(rng, -5, 65)
+            days = [
+                start + timedelta(days=offset) for offset in range((end - start).days + 1)
+                if timeline_start <= start + timedelta(days=offset) <= timeline_end
+            ]
+            expected = max((booked_on(bookings, day) for day in days), default=0)
+            assert timeline.peak(start, end) == expected, (start, end)
+
+
+def test_index_evicts_least_recently_used():
+    index = CapacityTimelineIndex(max_entries=2)
+    end = ORIGIN + timedelta(days=9)
+    for resource_id in (1, 2):
+        index.build(resource_id, ORIGIN, end, [], 'v1')
+
+    assert index.get(1, ORIGIN, end, 'v1') is not None
+    index.build(3, ORIGIN, end, [], 'v1')
+
+    assert len(index) == 2
+    assert index.get(2, ORIGIN, end, 'v1') is None
+    assert index.get(1, ORIGIN, end, 'v1') is not None
+    assert index.get(3, ORIGIN, end, 'v1') is not None
+
+
+def test_failed_bulk_batch_leaves_cached_timelines_unchanged(db_service, session, make_resource):
+    resource = make_resource(person_count=2)
+
+    def booking(persons, day):
+        return {
+            'resource_id': resource.id,
+            'trade_id': 1,
+            'allocated_person_count': persons,
+            'allocated_start_date': date(2024, 1, day),
+            'allocated_end_date': date(2024, 1, day),
+            'allocation_status': 'accepted',
+        }
+
+    # The second item does not fit next to the first one
+    with pytest.raises(ValueError):
+        db_service.bulk_create_allocations(session, [booking(2, 5), booking(1, 5)], 1)
+
+    created = db_service.bulk_create_allocations(session, [booking(2, 5)], 1)
+    assert len(created) == 1
+    with pytest.raises(ValueError):
+        db_service.create_allocation(session, booking(1, 5), 1)
+
+
+def test_capacity_is_checked_against_bookings_of_other_workers(db_service, session, make_resource):
+    other_worker = type(db_service)(str(db_service.engine.url))
+    other_session = other_worker.get_session()
+    try:
+        resource = make_resource(person_count=3)
+
+        def booking(persons, day, status='accepted'):
+            return {
+                'resource_id': resource.id,
+                'trade_id': 1,
+                'allocated_person_count': persons,
+                'allocated_start_date': date(2024, 1, day),
+                'allocated_end_date': date(2024, 1, day),
+                'allocation_status': status,
+            }
+
+        # Both workers have a timeline of the resource; the other one's misses the second booking
+        other_worker.create_allocation(other_session, booking(1, 6), 1)
+        db_service.create_allocation(session, booking(2, 6), 1)
+        with pytest.raises(ValueError):
+            other_worker.create_allocation(other_session, booking(1, 6), 1)
+
+        # Accepting a pending allocation is checked against capacity too
+        pending = db_service.create_allocation(session, booking(1, 7, 'pre_selected'), 1)
+        other_worker.create_allocation(other_session, booking(3, 7), 1)
+        with pytest.raises(ValueError):
+            db_service.update_allocation_status(session, pending.id, 'accepted')
+    finally:
+        other_session.close()
+        other_worker.replicas.stop()
+        other_worker.engine.dispose()
+
+
+def test_concurrent_bookings_cannot_overbook(db_service, session, make_resource):
+    resource = make_resource(person_count=2)
+    resource_id = resource.id
+    other_worker = type(db_service)(str(db_service.engine.url))
+    other_session = other_worker.get_session()
+    booking = {
+        'resource_id': resource_id,
+        'trade_id': 1,
+        'allocated_person_count': 2,
+        'allocated_start_date': date(2024, 1, 10),
+        'allocated_end_date': date(2024, 1, 12),
+        'allocation_status': 'accepted',
+    }
+    outcome = {}
+
+    def book_on_other_worker():
+        try:
+            other_worker.create_allocation(other_session, dict(booking), 2)
+            outcome['other'] = 'booked'
+        except ValueError:
+            outcome['other'] = 'refused'
+
+    # The other worker books all persons between this worker's capacity check and its commit
+    check_availability = db_service._check_resource_availability
+
+    def check_then_let_other_worker_book(*args):
+        available = check_availability(*args)
+        other = threading.Thread(target=book_on_other_worker)
+        other.start()
+        other.join(0.5)
+        outcome['thread'] = other
+        return available
+
+    db_service._check_resource_availability = check_then_let_other_worker_book
+    try:
+        db_service.create_allocation(session, dict(booking), 1)
+        outcome['thread'].join()
+    finally:
+        other_session.close()
+        other_worker.replicas.stop()
+        other_worker.engine.dispose()
+
+    assert outcome['other'] == 'refused'
+    booked = session.query(func.sum(ResourceAllocation.allocated_person_count)).filter(
+        ResourceAllocation.resource_id == resource_id
+    ).scalar()
+    assert booked == 2
@@ -0,0 +1,134 @@
+"""
+Columnar response encodings
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+
+from backend.services.columnar import (
+    ARROW_FILE_MEDIA_TYPE, ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode_columns, negotiate
+)
+
+ROWS = [
+    {'id': 1, 'start_date': date(2024, 1, 1), 'hourly_rate': Decimal('45.50'), 'skills': ['Kran']},
+    {'id': 2, 'start_date': date(2024, 1, 2), 'hourly_rate': None, 'skills': []},
+]
+TYPES = {'id': int, 'start_date': date, 'hourly_rate': Optional[Decimal], 'skills': Optional[List[str]]}
+
+
+@pytest.mark.parametrize('accept, expected', [
+    (None, None),
+    ('*/*', None),
+    ('application/json', None),
+    ('text/csv', None),
+    ('application/x-msgpack', MSGPACK_MEDIA_TYPE),
+    ('application/vnd.apache.arrow.stream', ARROW_MEDIA_TYPE),
+    ('application/vnd.apache.arrow.file', ARROW_FILE_MEDIA_TYPE),
+    ('application/json;q=0.5, application/vnd.msgpack', MSGPACK_MEDIA_TYPE),
+    ('application/vnd.msgpack;q=0.2, application/json', None),
+])
+def test_negotiate(accept, expected):
+    pytest.importorskip('msgpack')
+    pytest.importorskip('pyarrow')
+
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize('media_type', [ARROW_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE])
+def test_arrow_stream_and_file_formats(media_type):
+    pa = pytest.importorskip('pyarrow')
+
+    body = encode_columns(media_type, ROWS, TYPES)
+
+    if media_type == ARROW_FILE_MEDIA_TYPE:
+        table = pa.ipc.open_file(pa.BufferReader(body)).read_all()
+    else:
+        table = pa.ipc.open_stream(pa.BufferReader(body)).read_all()
+    assert table.to_pylist() == ROWS
+
+
+def test_msgpack_columns():
+    msgpack = pytest.importorskip('msgpack')
+
+    columns = msgpack.unpackb(encode_columns(MSGPACK_MEDIA_TYPE, ROWS, TYPES))
+
+    assert columns == {
+        'id': [1, 2],
+        'start_date': ['2024-01-01', '2024-01-02'],
+        'hourly_rate': ['45.50', None],
+        'skills': [['Kran'], []],
+    }
+
+
+LISTS = [
+    ('/api/v1/resources/', {}),
+    ('/api/v1/resources/my', {}),
+    ('/api/v1/resources/allocations/my', {}),
+    ('/api/v1/resources/allocations/trade/1', {}),
+    ('/api/v1/resources/calendar', {'service_provider_id': 1, 'start_date': '2024-01-01', 'end_date': '2024-01-10'}),
+    ('/api/v1/resources/kpis', {'service_provider_id': 1, 'period_start': '2024-01-01', 'period_end': '2024-01-31'}),
+]
+
+
+@pytest.fixture
+def stored(api_client):
+    for day, rate in [(1, '45.50'), (4, None)]:
+        resource = api_client.post('/api/v1/resources/', json={
+            'service_provider_id': 1, 'start_date': f'2024-01-{day:02d}', 'end_date': '2024-01-31',
+            'person_count': 2, 'category': 'Bau', 'hourly_rate': rate, 'skills': ['Kran'] if rate else [],
+        }).json()
+        response = api_client.post('/api/v1/resources/allocations', json={
+            'resource_id': resource['id'], 'trade_id': 1, 'allocated_person_count': 1,
+            'allocated_start_date': '2024-01-05', 'allocated_end_date': '2024-01-06',
+            'allocation_status': 'accepted', 'total_cost': '200.00',
+        })
+        assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize('path, params', LISTS)
+@pytest.mark.parametrize('accept', ['application/x-msgpack', 'application/vnd.msgpack'])
+def test_endpoints_send_msgpack_columns_when_asked(api_client, stored, path, params, accept):
+    msgpack = pytest.importorskip('msgpack')
+    rows = api_client.get(path, params=params).json()
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    response = api_client.get(path, params=params, headers={'Accept': accept})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == MSGPACK_MEDIA_TYPE
+    assert response.headers['Vary'] == 'Accept'
+    columns = msgpack.unpackb(response.content)
+    assert list(columns) == list(rows[0])
+    assert columns == {name: [row[name] for row in rows] for name in rows[0]}
+
+
+@pytest.mark.parametrize('path, params', LISTS)
+@pytest.mark.parametrize('accept', [None, '*/*', 'application/json', 'application/vnd.msgpack;q=0.2, application/json'])
+def test_endpoints_default_to_json(api_client, stored, path, params, accept):
+    headers = {'Accept': accept} if accept else {}
+
+    response = api_client.get(path, params=params, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json()
+
+
+def test_conditional_reads_tag_each_format(api_client, stored):
+    pytest.importorskip('msgpack')
+    path, params = LISTS[4]
+    msgpack_headers = {'Accept': 'application/x-msgpack'}
+    json_etag = api_client.get(path, params=params).headers['ETag']
+    msgpack_etag = api_client.get(path, params=params, headers=msgpack_headers).headers['ETag']
+
+    assert json_etag != msgpack_etag
+    assert api_client.get(
+        path, params=params, headers={**msgpack_headers, 'If-None-Match': json_etag}
+    ).status_code == 200
+    assert api_client.get(
+        path, params=params, headers={**msgpack_headers, 'If-None-Match': msgpack_etag}
+    ).status_code == 304
@@ -0,0 +1,56 @@
+"""
+Engine configuration from the environment
+"""
+
+import os
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, text
+
+from backend.services.db_config import configure_sqlite_pragmas, engine_options, is_sqlite_memory, pool_metrics
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_pool_options_from_environment(monkeypatch):
+    monkeypatch.setenv('RESOURCE_DB_POOL_SIZE', '3')
+    monkeypatch.setenv('RESOURCE_DB_MAX_OVERFLOW', '0')
+    monkeypatch.setenv('RESOURCE_DB_POOL_PRE_PING', 'false')
+
+    options = engine_options('postgresql://user@localhost/resources')
+
+    assert options['pool_size'] == 3
+    assert options['max_overflow'] == 0
+    assert options['pool_timeout'] == 30
+    assert options['pool_recycle'] == 1800
+    assert options['pool_pre_ping'] is False
+
+
+def test_in_memory_sqlite_gets_no_sized_pool():
+    assert is_sqlite_memory('sqlite://')
+    assert is_sqlite_memory('sqlite:///:memory:')
+    assert not is_sqlite_memory('sqlite:///resources.db')
+    assert 'pool_size' not in engine_options('sqlite:///:memory:')
+
+
+def test_sqlite_pragmas_and_pool_metrics(tmp_path, monkeypatch):
+    monkeypatch.setenv('RESOURCE_SQLITE_BUSY_TIMEOUT_MS', '1234')
+    url = f"sqlite:///{tmp_path / 'resources.db'}"
+    engine = create_engine(url, **engine_options(url))
+    configure_sqlite_pragmas(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+        assert pool_metrics(engine)['checkedout'] == 1
+    engine.dispose()
+
+
+def test_importing_the_api_creates_no_database(tmp_path):
+    environment = {**os.environ, 'PYTHONPATH': FRONTEND_DIR}
+    environment.pop('DATABASE_URL', None)
+
+    subprocess.run([sys.executable, '-c', 'import backend.resources_api'], cwd=tmp_path, env=environment, check=True)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,71 @@
+"""
+NDJSON exports against the JSON list endpoints
+"""
+
+import json
+import random
+
+import pytest
+
+CALENDAR = {'service_provider_id': 1, 'start_date': '2024-01-01', 'end_date': '2024-02-15'}
+
+
+def ndjson(response):
+    assert response.status_code == 200, response.text
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert response.content == b'' or response.content.endswith(b'\n')
+    return [json.loads(line) for line in response.content.splitlines()]
+
+
+@pytest.fixture
+def resources(api_client):
+    rng = random.Random(23)
+    created = []
+    for _ in range(30):
+        first = rng.randint(1, 20)
+        response = api_client.post('/api/v1/resources/', json={
+            'service_provider_id': 1,
+            'start_date': f'2024-01-{first:02d}',
+            'end_date': f'2024-01-{first + rng.randint(0, 10):02d}',
+            'person_count': rng.randint(1, 5),
+            'category': rng.choice(['Bau', 'Elektro']),
+            'hourly_rate': rng.choice(['45.50', '60.00', None]),
+            'skills': rng.sample(['Kran', 'Schweißen'], rng.randint(0, 2)),
+        })
+        assert response.status_code == 200, response.text
+        created.append(response.json())
+    for resource in created[::4]:
+        response = api_client.post('/api/v1/resources/allocations', json={
+            'resource_id': resource['id'],
+            'trade_id': 1,
+            'allocated_person_count': 1,
+            'allocated_start_date': resource['start_date'],
+            'allocated_end_date': resource['start_date'],
+            'allocation_status': 'accepted',
+        })
+        assert response.status_code == 200, response.text
+    return created
+
+
+@pytest.mark.parametrize('filters', [{}, {'category': 'Elektro'}, {'min_persons': 3, 'start_date': '2024-01-15'}])
+def test_resource_export_matches_the_list(api_client, resources, filters):
+    exported = ndjson(api_client.get('/api/v1/resources/export', params=filters))
+    listed = api_client.get('/api/v1/resources/', params={**filters, 'limit': 1000}).json()
+
+    assert exported and exported == listed
+
+
+def test_resource_export_without_matches_is_empty(api_client, resources):
+    assert ndjson(api_client.get('/api/v1/resources/export', params={'category': 'Dach'})) == []
+
+
+def test_calendar_export_matches_the_calendar(api_client, resources):
+    exported = ndjson(api_client.get('/api/v1/resources/calendar/export', params=CALENDAR))
+    listed = api_client.get('/api/v1/resources/calendar', params=CALENDAR).json()
+
+    key = lambda entry: (entry['entry_date'], entry['resource_id'] or 0)
+    assert exported and sorted(exported, key=key) == sorted(listed, key=key)
+    assert {entry['status'] for entry in exported} >= {'available', 'allocated'}
+    # Streamed resource by resource
+    resource_ids = [entry['resource_id'] for entry in exported]
+    assert resource_ids == sorted(resource_ids)
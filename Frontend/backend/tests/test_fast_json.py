@@ -0,0 +1,98 @@
+"""
+Fast JSON responses against the Pydantic response models they skip
+"""
+
+import json
+
+import pytest
+
+from backend import resources_api
+from backend.models import resource_models
+from backend.services import serializers
+
+
+@pytest.fixture
+def stored(api_client):
+    """Resources and allocations created through the API, in each field's edge cases"""
+    resources = []
+    for day, rate, skills in [(1, '45.50', ['Kran', 'Schweißen']), (3, None, []), (3, '60', ['Maurer'])]:
+        response = api_client.post('/api/v1/resources/', json={
+            'service_provider_id': 1,
+            'start_date': f'2024-01-{day:02d}',
+            'end_date': '2024-01-31',
+            'person_count': 3,
+            'category': 'Bau',
+            'hourly_rate': rate,
+            'daily_rate': '364.00' if rate else None,
+            'skills': skills,
+            'description': 'Kolonne "Nord"\nmit Ümlauten',
+        })
+        assert response.status_code == 200, response.text
+        resources.append(response.json())
+    for resource, status in zip(resources, ['accepted', 'pre_selected']):
+        response = api_client.post('/api/v1/resources/allocations', json={
+            'resource_id': resource['id'],
+            'trade_id': 7,
+            'allocated_person_count': 2,
+            'allocated_start_date': '2024-01-10',
+            'allocated_end_date': '2024-01-12',
+            'allocation_status': status,
+            'agreed_hourly_rate': '48.25',
+            'total_cost': '1158.00',
+        })
+        assert response.status_code == 200, response.text
+    return resources
+
+
+def model_json(model, rows):
+    """What the response model would have written for rows (ORM objects or dicts)"""
+    return [json.loads(model.model_validate(row, from_attributes=True).model_dump_json()) for row in rows]
+
+
+def stored_rows(orm_class):
+    with resources_api.get_db_service().service.get_session() as session:
+        return session.query(orm_class).order_by(orm_class.id).all()
+
+
+def by_id(rows):
+    return sorted(rows, key=lambda row: row['id'])
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    """Run with orjson and with the standard library fallback"""
+    if request.param == 'json':
+        monkeypatch.setattr(serializers, 'orjson', None)
+    elif serializers.orjson is None:
+        pytest.skip('orjson is not installed')
+    return request.param
+
+
+@pytest.mark.parametrize('path', ['/api/v1/resources/', '/api/v1/resources/my'])
+def test_resource_lists_match_the_model(api_client, stored, encoder, path):
+    response = api_client.get(path)
+
+    assert response.headers['content-type'] == 'application/json'
+    rows = by_id(response.json())
+    assert rows == model_json(resources_api.Resource, stored_rows(resource_models.Resource))
+    assert [list(row) for row in rows] == [list(resources_api.Resource.model_fields)] * len(rows)
+    assert rows[0]['hourly_rate'] == '45.50' and rows[1]['hourly_rate'] is None
+    assert [row['skills'] for row in rows] == [['Kran', 'Schweißen'], [], ['Maurer']]
+
+
+@pytest.mark.parametrize('path', ['/api/v1/resources/allocations/my', '/api/v1/resources/allocations/trade/7'])
+def test_allocation_lists_match_the_model(api_client, stored, encoder, path):
+    rows = by_id(api_client.get(path).json())
+
+    assert rows == model_json(resources_api.ResourceAllocation, stored_rows(resource_models.ResourceAllocation))
+    assert {row['total_cost'] for row in rows} == {'1158.00'}
+
+
+def test_calendar_matches_the_model(api_client, stored, encoder):
+    response = api_client.get('/api/v1/resources/calendar', params={
+        'service_provider_id': 1, 'start_date': '2024-01-01', 'end_date': '2024-01-15'
+    })
+    rows = response.json()
+
+    assert rows and rows == model_json(resources_api.ResourceCalendarEntry, rows)
+    assert [list(row) for row in rows] == [list(resources_api.ResourceCalendarEntry.model_fields)] * len(rows)
@@ -0,0 +1,177 @@
+"""
+Geo search: the grid index against the SQL bounding-box search
+"""
+
+from datetime import date, timedelta
+import json
+import random
+
+import numpy as np
+import pytest
+
+from backend.services import resource_db_service
+from backend.services.geo import haversine_km, haversine_km_batch, haversine_km_matrix
+from backend.services.resource_db_service import ResourceDatabaseService
+
+BERLIN = (52.52, 13.40)
+
+
+def random_points(rng, count):
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(count)]
+
+
+def test_batch_distances_match_scalar_haversine():
+    rng = random.Random(3)
+    # Antipodal, identical and antimeridian-crossing pairs besides random ones
+    points = random_points(rng, 200) + [(-52.52, -166.6), (52.52, 13.40), (52.52, -179.99), (90.0, 0.0)]
+    latitudes, longitudes = zip(*points)
+
+    distances = haversine_km_batch(*BERLIN, latitudes, longitudes)
+
+    assert distances.shape == (len(points),)
+    np.testing.assert_allclose(distances, [haversine_km(*BERLIN, *point) for point in points], rtol=1e-9, atol=1e-6)
+
+
+def test_distance_matrix_matches_scalar_haversine():
+    rng = random.Random(4)
+    origins, points = random_points(rng, 7), random_points(rng, 30)
+
+    matrix = haversine_km_matrix(*zip(*origins), *zip(*points))
+
+    assert matrix.shape == (7, 30)
+    expected = [[haversine_km(*origin, *point) for point in points] for origin in origins]
+    np.testing.assert_allclose(matrix, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_geo_search_returns_distances_nearest_first(db_service, session):
+    rng = random.Random(5)
+    for _ in range(40):
+        db_service.create_resource(session, resource_data(52.52 + rng.uniform(-1, 1), 13.40 + rng.uniform(-1, 1)), 1)
+
+    found = db_service.search_resources_geo(session, *BERLIN, 60)
+
+    assert found
+    distances = [resource.distance_km for resource in found]
+    assert distances == sorted(distances) and distances[-1] <= 60
+    for resource in found:
+        assert resource.distance_km == pytest.approx(haversine_km(*BERLIN, resource.latitude, resource.longitude))
+
+
+@pytest.fixture
+def indexed_service(db_service):
+    """Second service on the test database, serving geo searches from the grid index"""
+    service = ResourceDatabaseService(str(db_service.engine.url), use_geo_index=True)
+    yield service
+    service.replicas.stop()
+    service.engine.dispose()
+
+
+def resource_data(latitude, longitude, **overrides):
+    data = {
+        'start_date': date(2024, 1, 1),
+        'end_date': date(2024, 1, 31),
+        'person_count': 4,
+        'category': 'Bau',
+        'latitude': latitude,
+        'longitude': longitude,
+    }
+    data.update(overrides)
+    return data
+
+
+def found_ids(service, session, radius_km=50, filters=None, limit=100, offset=0):
+    session.expire_all()
+    return [
+        resource.id for resource in
+        service.search_resources_geo(session, *BERLIN, radius_km, filters, limit=limit, offset=offset)
+    ]
+
+
+def test_index_follows_writes_of_other_workers(db_service, session, indexed_service):
+    near = db_service.create_resource(session, resource_data(52.53, 13.40), 1)
+    far = db_service.create_resource(session, resource_data(48.14, 11.58), 1)
+
+    with indexed_service.get_session() as indexed_session:
+        assert found_ids(indexed_service, indexed_session) == [near.id]
+
+        # Written through the other service, which does not maintain this index
+        nearer = db_service.create_resource(session, resource_data(52.521, 13.40), 1)
+        db_service.update_resource(session, far.id, {'latitude': 52.60, 'longitude': 13.40})
+        assert found_ids(indexed_service, indexed_session) == [nearer.id, near.id, far.id]
+
+        db_service.delete_resource(session, near.id)
+        assert found_ids(indexed_service, indexed_session) == [nearer.id, far.id]
+        assert indexed_service.geo_index.resource_count == 2
+
+
+def test_filtered_index_search_pages_like_sql(db_service, session, indexed_service, monkeypatch):
+    monkeypatch.setattr(resource_db_service, 'GEO_FILTER_CHUNK_SIZE', 3)
+    for step in range(20):
+        db_service.create_resource(session, resource_data(
+            52.52 + step * 0.01, 13.40, category='Bau' if step % 3 else 'Elektro', person_count=1 + step % 4
+        ), 1)
+    filters = {'category': 'Bau', 'min_persons': 2}
+
+    with indexed_service.get_session() as indexed_session:
+        for limit, offset in [(100, 0), (4, 0), (4, 5), (3, 11), (5, 20)]:
+            assert found_ids(indexed_service, indexed_session, filters=filters, limit=limit, offset=offset) == \
+                found_ids(db_service, session, filters=filters, limit=limit, offset=offset)
+
+
+def test_geo_search_applies_search_filters(db_service, session, indexed_service):
+    rng = random.Random(6)
+    resources = []
+    for _ in range(60):
+        start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 60))
+        resources.append(db_service.create_resource(session, resource_data(
+            52.52 + rng.uniform(-0.5, 0.5), 13.40 + rng.uniform(-0.5, 0.5),
+            category=rng.choice(['Bau', 'Elektro']),
+            status=rng.choice(['available', 'allocated']),
+            start_date=start, end_date=start + timedelta(days=rng.randint(0, 30)),
+            person_count=rng.randint(1, 6),
+            hourly_rate=rng.choice([40, 55, 70]),
+            skills=json.dumps(rng.sample(['Schweißen', 'Kran', 'Maurer'], rng.randint(0, 3))),
+            equipment=json.dumps(rng.sample(['Bagger', 'Gerüst'], rng.randint(0, 2)))
+        ), rng.choice([1, 2])))
+
+    def expected(filters, limit=100, offset=0):
+        within = []
+        for resource in resources:
+            distance = haversine_km(*BERLIN, resource.latitude, resource.longitude)
+            if distance > 30:
+                continue
+            if 'category' in filters and resource.category != filters['category']:
+                continue
+            if 'status' in filters and resource.status != filters['status']:
+                continue
+            if 'service_provider_id' in filters and resource.service_provider_id != filters['service_provider_id']:
+                continue
+            if 'start_date' in filters and resource.end_date < filters['start_date']:
+                continue
+            if 'end_date' in filters and resource.start_date > filters['end_date']:
+                continue
+            if 'min_persons' in filters and resource.person_count < filters['min_persons']:
+                continue
+            if 'max_hourly_rate' in filters and resource.hourly_rate > filters['max_hourly_rate']:
+                continue
+            if not set(filters.get('skills', [])) <= set(resource.skills_list):
+                continue
+            if 'equipment' in filters and not set(filters['equipment']) & set(resource.equipment_list):
+                continue
+            within.append((distance, resource.id))
+        return [resource_id for _, resource_id in sorted(within)][offset:offset + limit]
+
+    filter_sets = [
+        {},
+        {'category': 'Bau', 'min_persons': 3},
+        {'status': 'available', 'max_hourly_rate': 55, 'service_provider_id': 1},
+        {'start_date': date(2024, 2, 1), 'end_date': date(2024, 2, 10)},
+        {'skills': ['Schweißen', 'Kran']},
+        {'equipment': ['Bagger'], 'category': 'Elektro'},
+    ]
+    with indexed_service.get_session() as indexed_session:
+        for filters in filter_sets:
+            for limit, offset in [(100, 0), (3, 2)]:
+                wanted = expected(filters, limit, offset)
+                assert found_ids(db_service, session, 30, filters, limit, offset) == wanted, filters
+                assert found_ids(indexed_service, indexed_session, 30, filters, limit, offset) == wanted, filters
@@ -0,0 +1,108 @@
+"""
+Conditional requests: ETag/Last-Modified validators and 304 responses of the read endpoints
+"""
+
+from email.utils import parsedate_to_datetime
+
+import pytest
+
+READS = {
+    'calendar': ('/api/v1/resources/calendar', {
+        'service_provider_id': 1, 'start_date': '2024-01-01', 'end_date': '2024-01-31'
+    }),
+    'kpis': ('/api/v1/resources/kpis', {
+        'service_provider_id': 1, 'period_start': '2024-01-01', 'period_end': '2024-01-31'
+    }),
+    'allocations': ('/api/v1/resources/allocations/my', {}),
+    'resources': ('/api/v1/resources/my', {}),
+}
+
+
+def create_resource(client, **overrides):
+    data = {
+        'service_provider_id': 1,
+        'start_date': '2024-01-01',
+        'end_date': '2024-01-31',
+        'person_count': 4,
+        'category': 'Bau',
+        'hourly_rate': '50.00',
+    }
+    data.update(overrides)
+    response = client.post('/api/v1/resources/', json=data)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_allocation(client, resource, day, **overrides):
+    data = {
+        'resource_id': resource['id'],
+        'trade_id': 1,
+        'allocated_person_count': 1,
+        'allocated_start_date': f'2024-01-{day:02d}',
+        'allocated_end_date': f'2024-01-{day + 2:02d}',
+        'allocation_status': 'accepted',
+        'total_cost': '150.00',
+    }
+    data.update(overrides)
+    response = client.post('/api/v1/resources/allocations', json=data)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def resource(api_client):
+    resource = create_resource(api_client)
+    create_allocation(api_client, resource, 5)
+    return resource
+
+
+@pytest.mark.parametrize('read', list(READS))
+def test_if_none_match_answers_304_until_a_write(api_client, resource, read):
+    path, params = READS[read]
+    first = api_client.get(path, params=params)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('"') and first.headers['Vary'] == 'Accept'
+    assert parsedate_to_datetime(first.headers['Last-Modified'])
+
+    cached = api_client.get(path, params=params, headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.content == b''
+    assert cached.headers['ETag'] == etag
+    assert cached.headers['Last-Modified'] == first.headers['Last-Modified']
+    for if_none_match in ('*', f'"other", {etag}'):
+        assert api_client.get(path, params=params, headers={'If-None-Match': if_none_match}).status_code == 304
+    assert api_client.get(path, params=params, headers={'If-None-Match': '"other"'}).status_code == 200
+
+    create_allocation(api_client, resource, 12)
+
+    changed = api_client.get(path, params=params, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.json() != first.json()
+    assert api_client.get(
+        path, params=params, headers={'If-None-Match': changed.headers['ETag']}
+    ).status_code == 304
+
+
+def test_validators_differ_per_query(api_client, resource):
+    path, params = READS['calendar']
+    etags = {
+        api_client.get(path, params={**params, **changed}).headers['ETag']
+        for changed in ({}, {'end_date': '2024-01-20'}, {'service_provider_id': 2})
+    }
+    assert len(etags) == 3
+
+
+def test_my_resources_follow_resource_updates(api_client, resource):
+    path, _ = READS['resources']
+    first = api_client.get(path)
+
+    response = api_client.put(f"/api/v1/resources/{resource['id']}", json={'person_count': 6})
+    assert response.status_code == 200, response.text
+
+    changed = api_client.get(path, headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert [row['person_count'] for row in changed.json()] == [6]
+    assert parsedate_to_datetime(changed.headers['Last-Modified']) >= \
+        parsedate_to_datetime(first.headers['Last-Modified'])
@@ -0,0 +1,199 @@
+"""
+KPI aggregation and the rollups get_kpis reads
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+import random
+
+import pytest
+
+
+def test_query_kpi_metrics_counts_overlaps_within_the_period(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    make_resource(start_date=date(2024, 1, 20), end_date=date(2024, 2, 10), person_count=2)
+    make_resource(start_date=date(2024, 3, 1), end_date=date(2024, 3, 31))
+    make_allocation(resource, allocated_start_date=date(2024, 1, 5), allocated_end_date=date(2024, 1, 11),
+                    allocated_person_count=2, allocation_status='accepted', total_cost=700)
+    completed = make_allocation(resource, allocated_start_date=date(2024, 1, 20), allocated_end_date=date(2024, 1, 25),
+                                total_cost=300)
+    db_service.update_allocation_status(session, completed.id, 'completed')
+
+    metrics = db_service._query_kpi_metrics(session, 1, date(2024, 1, 10), date(2024, 1, 21))
+
+    assert metrics == {
+        'total_resources_available': 2,
+        'total_resources_allocated': 1,
+        'total_resources_completed': 0,
+        'total_person_days_available': 12 * 4 + 2 * 2,
+        'total_person_days_allocated': 2 * 2,
+        'total_person_days_completed': 2 * 1,
+        'total_revenue': Decimal('300'),
+        'total_potential_revenue': Decimal('700'),
+        'total_invitations_sent': 0,
+        'total_offers_submitted': 0,
+        'total_offers_accepted': 1,
+    }
+    assert db_service._query_kpi_metrics(session, 2, date(2024, 1, 10), date(2024, 1, 21))['total_revenue'] == 0
+
+
+def test_kpi_rates(db_service):
+    rates = db_service._kpi_rates({
+        'total_person_days_allocated': 30,
+        'total_person_days_available': 120,
+        'total_offers_accepted': 1,
+        'total_offers_submitted': 4,
+    })
+
+    assert rates == {'utilization_rate': pytest.approx(25.0), 'success_rate': pytest.approx(25.0)}
+    assert db_service._kpi_rates({
+        'total_person_days_allocated': 0,
+        'total_person_days_available': 0,
+        'total_offers_accepted': 0,
+        'total_offers_submitted': 0,
+    }) == {'utilization_rate': 0, 'success_rate': 0}
+
+
+PERIODS = [
+    (date(2023, 12, 1), date(2024, 3, 31)),
+    (date(2024, 1, 1), date(2024, 1, 31)),
+    (date(2024, 1, 10), date(2024, 1, 12)),
+    (date(2024, 1, 20), date(2024, 2, 15)),
+    (date(2024, 2, 1), date(2024, 2, 1)),
+    (date(2024, 6, 1), date(2024, 6, 30)),
+]
+
+
+def assert_kpis_match(db_service, session, provider_ids=(1, 2)):
+    for provider_id in provider_ids:
+        for period_start, period_end in PERIODS:
+            kpis = db_service.get_kpis(session, provider_id, period_start, period_end)
+            expected = db_service._query_kpi_metrics(session, provider_id, period_start, period_end)
+            for metric, value in expected.items():
+                assert float(getattr(kpis, metric)) == pytest.approx(float(value)), \
+                    (provider_id, period_start, period_end, metric)
+
+
+def test_kpis_after_create(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    make_resource(provider_id=2, start_date=date(2024, 1, 15), end_date=date(2024, 2, 10), person_count=2)
+    make_allocation(resource, allocated_start_date=date(2024, 1, 5), allocated_end_date=date(2024, 1, 11),
+                    allocated_person_count=2, total_cost=700)
+    make_allocation(resource, allocated_start_date=date(2024, 1, 20), allocated_end_date=date(2024, 1, 25),
+                    allocation_status='accepted', total_cost=300)
+    db_service.bulk_create_allocations(session, [{
+        'resource_id': resource.id,
+        'trade_id': 2,
+        'allocated_person_count': 1,
+        'allocated_start_date': date(2024, 1, 30),
+        'allocated_end_date': date(2024, 1, 31),
+        'allocation_status': 'confirmed',
+        'total_cost': 100,
+    }], 1)
+
+    assert_kpis_match(db_service, session)
+
+
+def test_kpis_after_update(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    moved = make_resource(provider_id=2)
+    make_allocation(resource, allocated_start_date=date(2024, 1, 5), allocated_end_date=date(2024, 1, 8),
+                    allocation_status='accepted', total_cost=400)
+
+    db_service.update_resource(session, resource.id, {
+        'end_date': date(2024, 2, 20),
+        'person_count': 6,
+        'status': 'allocated',
+    })
+    db_service.update_resource(session, moved.id, {'service_provider_id': 1})
+
+    assert_kpis_match(db_service, session)
+
+
+def test_kpis_after_status_change(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    allocations = [
+        make_allocation(resource, allocated_start_date=date(2024, 1, day), allocated_end_date=date(2024, 1, day + 3),
+                        total_cost=100 * day)
+        for day in (2, 9, 16, 23)
+    ]
+
+    for allocation, status in zip(allocations, ['accepted', 'completed', 'rejected', 'offer_submitted']):
+        db_service.update_allocation_status(session, allocation.id, status)
+    assert_kpis_match(db_service, session)
+
+    db_service.update_allocation_status(session, allocations[0].id, 'completed')
+    assert_kpis_match(db_service, session)
+
+
+def test_kpis_after_writes_in_random_date_order(db_service, session, make_resource, make_allocation):
+    rng = random.Random(3)
+    origin = date(2024, 1, 1)
+    resources = []
+    for _ in range(6):
+        start = origin + timedelta(days=rng.randint(0, 90))
+        resources.append(make_resource(
+            provider_id=rng.choice([1, 2]), start_date=start, end_date=start + timedelta(days=rng.randint(0, 60)),
+            person_count=rng.randint(3, 8)
+        ))
+    for _ in range(15):
+        resource = rng.choice(resources)
+        start = resource.start_date + timedelta(days=rng.randint(0, (resource.end_date - resource.start_date).days))
+        end = min(resource.end_date, start + timedelta(days=rng.randint(0, 10)))
+        allocation = make_allocation(resource, allocated_start_date=start, allocated_end_date=end,
+                                     total_cost=rng.randint(1, 20) * 50)
+        db_service.update_allocation_status(session, allocation.id, rng.choice(['accepted', 'completed', 'rejected']))
+    db_service.update_resource(session, resources[0].id, {'start_date': origin - timedelta(days=30)})
+
+    for _ in range(40):
+        period_start = origin + timedelta(days=rng.randint(-45, 160))
+        period_end = period_start + timedelta(days=rng.randint(0, 70))
+        for provider_id in (1, 2):
+            kpis = db_service.get_kpis(session, provider_id, period_start, period_end)
+            expected = db_service._query_kpi_metrics(session, provider_id, period_start, period_end)
+            for metric, value in expected.items():
+                assert float(getattr(kpis, metric)) == pytest.approx(float(value)), \
+                    (provider_id, period_start, period_end, metric)
+
+
+def test_kpis_after_delete(db_service, session, make_resource, make_allocation):
+    kept = make_resource()
+    deleted = make_resource(start_date=date(2024, 1, 10), end_date=date(2024, 2, 5))
+    make_allocation(kept, allocated_start_date=date(2024, 1, 3), allocated_end_date=date(2024, 1, 4),
+                    allocation_status='accepted', total_cost=200)
+    make_allocation(deleted, allocated_start_date=date(2024, 1, 12), allocated_end_date=date(2024, 1, 20),
+                    allocation_status='accepted', total_cost=900)
+
+    assert db_service.delete_resource(session, deleted.id)
+
+    assert_kpis_match(db_service, session)
+
+
+def test_kpis_are_stored_through_the_batch_upsert(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    make_allocation(resource, allocation_status='accepted', total_cost=500)
+    period_start, period_end = date(2024, 1, 1), date(2024, 1, 31)
+
+    db_service.calculate_kpis(session, 1, period_start, period_end)
+    db_service.calculate_kpis_batch(session, [(period_start, period_end)], [1])
+    kpis = db_service.calculate_kpis(session, 1, period_start, period_end)
+
+    assert float(kpis.total_potential_revenue) == pytest.approx(500)
+    assert session.query(type(kpis)).filter_by(service_provider_id=1).count() == 1
+
+
+def test_kpi_batch_matches_single_periods(db_service, session, make_resource, make_allocation):
+    resource = make_resource()
+    other = make_resource(provider_id=2, start_date=date(2024, 1, 15), end_date=date(2024, 2, 15))
+    make_allocation(resource, allocated_start_date=date(2024, 1, 3), allocated_end_date=date(2024, 1, 9),
+                    allocation_status='accepted', total_cost=250)
+    make_allocation(other, allocated_start_date=date(2024, 2, 1), allocated_end_date=date(2024, 2, 3),
+                    allocation_status='confirmed', total_cost=90)
+
+    kpis = db_service.calculate_kpis_batch(session, PERIODS[:3], [1, 2])
+
+    assert len(kpis) == 2 * 3
+    for row in kpis:
+        expected = db_service._query_kpi_metrics(session, row.service_provider_id, row.period_start, row.period_end)
+        for metric, value in expected.items():
+            assert float(getattr(row, metric)) == pytest.approx(float(value)), (row.service_provider_id, metric)
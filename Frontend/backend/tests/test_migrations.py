@@ -0,0 +1,120 @@
+"""
+Data backfills of the Alembic migrations, run against tables written by the service
+"""
+
+from datetime import date, datetime, timedelta
+import importlib.util
+import os
+
+import pytest
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from backend.services.resource_db_service import CALENDAR_STATUS_COLORS
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def run_upgrade(db_service, filename, drop_table):
+    """Drop the table a migration creates and run the migration's upgrade"""
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(MIGRATIONS_DIR, filename))
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    with db_service.engine.begin() as connection:
+        connection.execute(sa.text(f'DROP TABLE {drop_table}'))
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+
+def test_004_collapses_daily_entries_into_intervals(db_service, session, make_resource, make_allocation):
+    resource = make_resource(end_date=date(2024, 1, 10))
+    tentative = make_allocation(resource, allocated_start_date=date(2024, 1, 3), allocated_end_date=date(2024, 1, 4))
+    booked = make_allocation(resource, allocated_start_date=date(2024, 1, 6), allocated_end_date=date(2024, 1, 7),
+                             allocation_status='accepted')
+    resource_id, tentative_id, booked_id = resource.id, tentative.id, booked.id
+    session.close()
+
+    # Daily rows as written before 004: tentative days carry no allocation_id
+    legacy_days = {
+        date(2024, 1, 3): ('tentative', None),
+        date(2024, 1, 4): ('tentative', None),
+        date(2024, 1, 6): ('allocated', booked_id),
+        date(2024, 1, 7): ('allocated', booked_id),
+        date(2024, 1, 9): ('tentative', None),  # no allocation covers it
+    }
+    now = datetime.utcnow()
+    with db_service.engine.begin() as connection:
+        for offset in range(10):
+            day = date(2024, 1, 1) + timedelta(days=offset)
+            status, allocation_id = legacy_days.get(day, ('available', None))
+            connection.execute(sa.text("""
+                INSERT INTO resource_calendar_entries (
+                    resource_id, allocation_id, service_provider_id, entry_date, person_count,
+                    hours_allocated, status, color, label, created_at, updated_at
+                ) VALUES (:resource_id, :allocation_id, 1, :day, 4, 8, :status, :color, 'Bau - 4 Personen', :now, :now)
+            """), {
+                'resource_id': resource_id, 'allocation_id': allocation_id, 'day': day,
+                'status': status, 'color': CALENDAR_STATUS_COLORS[status], 'now': now,
+            })
+
+    run_upgrade(db_service, '004_create_calendar_intervals.py', 'resource_calendar_intervals')
+
+    with db_service.engine.connect() as connection:
+        intervals = connection.execute(sa.text(
+            'SELECT allocation_id, start_date, end_date, status FROM resource_calendar_intervals ORDER BY id'
+        )).all()
+        remaining = connection.execute(sa.text('SELECT COUNT(*) FROM resource_calendar_entries')).scalar()
+    assert [tuple(row) for row in intervals] == [
+        (None, '2024-01-01', '2024-01-10', 'available'),
+        (tentative_id, '2024-01-03', '2024-01-04', 'tentative'),
+        (booked_id, '2024-01-06', '2024-01-07', 'allocated'),
+    ]
+    assert remaining == 0
+
+    session = db_service.get_session()
+    entries = db_service.get_calendar_entries(session, 1, date(2024, 1, 1), date(2024, 1, 10))
+    session.close()
+    assert [(entry['entry_date'].day, entry['status'], entry['allocation_id']) for entry in entries] == [
+        (1, 'available', None), (2, 'available', None), (3, 'tentative', tentative_id),
+        (4, 'tentative', tentative_id), (5, 'available', None), (6, 'allocated', booked_id),
+        (7, 'allocated', booked_id), (8, 'available', None), (9, 'available', None), (10, 'available', None),
+    ]
+
+
+def test_005_backfills_kpi_rollups(db_service, session, make_resource, make_allocation):
+    first = make_resource()
+    second = make_resource(provider_id=2, start_date=date(2024, 1, 10), end_date=date(2024, 2, 20), person_count=2)
+    make_allocation(first, allocated_start_date=date(2024, 1, 5), allocated_end_date=date(2024, 1, 9),
+                    allocation_status='accepted', total_cost=450)
+    completed = make_allocation(second, allocated_start_date=date(2024, 1, 12), allocated_end_date=date(2024, 2, 2),
+                                total_cost=1200)
+    db_service.update_allocation_status(session, completed.id, 'completed')
+    session.close()
+
+    run_upgrade(db_service, '005_create_kpi_rollups.py', 'resource_kpi_rollups')
+
+    session = db_service.get_session()
+    for provider_id in (1, 2):
+        for period_start, period_end in [(date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 1, 20), date(2024, 3, 1))]:
+            kpis = db_service.get_kpis(session, provider_id, period_start, period_end)
+            expected = db_service._query_kpi_metrics(session, provider_id, period_start, period_end)
+            for metric, value in expected.items():
+                assert float(getattr(kpis, metric)) == pytest.approx(float(value)), (provider_id, metric)
+    session.close()
+
+
+def test_007_backfills_resource_tags(db_service, session, make_resource):
+    make_resource(skills='["Schweißen", "Kran", "Kran"]', equipment='["Bagger"]')
+    make_resource(skills='not json', equipment=None)
+    with db_service.engine.connect() as connection:
+        before = set(connection.execute(sa.text('SELECT resource_id, kind, tag FROM resource_tags')).all())
+    session.close()
+
+    run_upgrade(db_service, '007_create_resource_tags.py', 'resource_tags')
+
+    with db_service.engine.connect() as connection:
+        after = set(connection.execute(sa.text('SELECT resource_id, kind, tag FROM resource_tags')).all())
+    assert after == before
+    assert len(after) == 3
@@ -0,0 +1,63 @@
+"""
+Cursor (keyset) pagination
+"""
+
+from datetime import date, timedelta
+import random
+
+import pytest
+
+from backend.services.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(date(2024, 2, 29), 1234)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (date(2024, 2, 29), 1234)
+    assert decode_cursor(encode_cursor('2024-02-29', 1234)) == (date(2024, 2, 29), 1234)
+
+
+@pytest.mark.parametrize('cursor', ['', 'not a cursor', encode_cursor('yesterday', 1)])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_only_for_full_pages():
+    rows = [{'id': 3, 'start_date': date(2024, 1, 5)}, {'id': 9, 'start_date': date(2024, 1, 7)}]
+
+    assert next_cursor(rows, 2, 'start_date') == encode_cursor(date(2024, 1, 7), 9)
+    assert next_cursor(rows, 3, 'start_date') is None
+    assert next_cursor(rows, None, 'start_date') is None
+
+
+def test_cursor_pages_cover_every_resource_once(db_service, session, make_resource):
+    rng = random.Random(3)
+    for _ in range(23):
+        start_date = date(2024, 1, 1) + timedelta(days=rng.randint(0, 5))
+        make_resource(start_date=start_date, end_date=start_date + timedelta(days=10))
+
+    seen = []
+    cursor = None
+    while True:
+        page = db_service.list_resources(session, limit=5, cursor=cursor)
+        seen.extend((resource.start_date, resource.id) for resource in page)
+        cursor = next_cursor(page, 5, 'start_date')
+        if cursor is None:
+            break
+
+    expected = [(resource.start_date, resource.id) for resource in db_service.list_resources(session, limit=100)]
+    assert seen == sorted(expected)
+    assert len(seen) == 23
+
+
+def test_cursor_pages_of_column_dicts(db_service, session, make_resource):
+    for day in (3, 1, 2, 1):
+        make_resource(start_date=date(2024, 1, day))
+
+    first = db_service.list_resources(session, limit=2, columns=['id', 'start_date'])
+    second = db_service.list_resources(session, limit=2, columns=['id', 'start_date'],
+                                       cursor=next_cursor(first, 2, 'start_date'))
+
+    assert [row['start_date'].day for row in first + second] == [1, 1, 2, 3]
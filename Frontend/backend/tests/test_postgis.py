@@ -0,0 +1,89 @@
+"""
+Migration 002 and ST_DWithin geo search on PostgreSQL/PostGIS
+"""
+
+from datetime import date
+import importlib.util
+import os
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from backend.models.resource_models import Base
+from backend.services.geo import haversine_km
+from backend.services.resource_db_service import ResourceDatabaseService
+
+pytestmark = pytest.mark.postgis
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations', '002_add_resource_geography.py'
+)
+
+BERLIN = (52.52, 13.40)
+
+
+def run_migration(engine, direction):
+    spec = importlib.util.spec_from_file_location('migration_002', MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            getattr(migration, direction)()
+
+
+@pytest.fixture
+def postgis_url():
+    url = os.environ['RESOURCE_TEST_POSTGIS_URL']
+    service = ResourceDatabaseService(url)
+    run_migration(service.engine, 'downgrade')
+    Base.metadata.drop_all(bind=service.engine)
+    service.replicas.stop()
+    service.engine.dispose()
+    yield url
+
+
+def create_resource(service, session, latitude, longitude):
+    return service.create_resource(session, {
+        'start_date': date(2024, 1, 1),
+        'end_date': date(2024, 1, 31),
+        'person_count': 2,
+        'category': 'Bau',
+        'latitude': latitude,
+        'longitude': longitude,
+    }, 1)
+
+
+def test_migration_002_backs_radius_search(postgis_url):
+    service = ResourceDatabaseService(postgis_url)
+    assert not service.has_postgis
+    with service.get_session() as session:
+        # Written before the migration: backfilled
+        backfilled = [create_resource(service, session, *point) for point in [(52.53, 13.41), (48.14, 11.58)]]
+    run_migration(service.engine, 'upgrade')
+    service.replicas.stop()
+    service.engine.dispose()
+
+    service = ResourceDatabaseService(postgis_url)
+    try:
+        assert service.has_postgis
+        with service.get_session() as session:
+            # Written after the migration: kept in sync by the trigger
+            inserted = create_resource(service, session, 52.60, 13.30)
+            moved = create_resource(service, session, 40.0, 0.0)
+            service.update_resource(session, moved.id, {'latitude': 52.45, 'longitude': 13.50})
+
+            found = service.search_resources_geo(session, *BERLIN, 20)
+
+            assert [resource.id for resource in found] == [backfilled[0].id, moved.id, inserted.id]
+            for resource in found:
+                assert resource.distance_km == pytest.approx(
+                    haversine_km(*BERLIN, resource.latitude, resource.longitude), rel=1e-2
+                )
+            assert [resource.id for resource in service.search_resources_geo(session, *BERLIN, 20, limit=1, offset=1)] \
+                == [moved.id]
+    finally:
+        run_migration(service.engine, 'downgrade')
+        Base.metadata.drop_all(bind=service.engine)
+        service.replicas.stop()
+        service.engine.dispose()
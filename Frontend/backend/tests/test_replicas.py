@@ -0,0 +1,39 @@
+"""
+Read replica routing
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+
+from backend.services.replicas import ReplicaRouter
+
+
+def test_failed_replica_is_skipped_until_healthy_again(tmp_path):
+    reachable = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter([reachable, unreachable])
+
+    assert [router.choose() for _ in range(4)] == [0, 1, 0, 1]
+
+    with pytest.raises(DBAPIError):
+        with unreachable.connect() as connection:
+            connection.execute(text('SELECT 1'))
+    router.mark_unhealthy(1)
+    assert [router.choose() for _ in range(3)] == [0, 0, 0]
+
+    router.check_health()
+    assert [router.choose() for _ in range(2)] == [0, 0]
+
+    (tmp_path / 'missing').mkdir()
+    router.check_health()
+    assert sorted(router.choose() for _ in range(2)) == [0, 1]
+
+
+def test_no_healthy_replica_means_primary(tmp_path):
+    router = ReplicaRouter([create_engine(f"sqlite:///{tmp_path / 'replica.db'}")])
+
+    router.mark_unhealthy(0)
+
+    assert router.choose() is None
+    assert ReplicaRouter([]).choose() is None
@@ -0,0 +1,99 @@
+"""
+Normalized skill and equipment tags
+"""
+
+from datetime import date
+import json
+
+import numpy as np
+
+from backend.models.resource_models import ResourceRequest, ResourceTag
+from backend.services.tag_bitsets import TagBitsetIndex
+
+
+def tags_of(session, resource_id):
+    return {
+        (kind, tag) for kind, tag in
+        session.query(ResourceTag.kind, ResourceTag.tag).filter(ResourceTag.resource_id == resource_id)
+    }
+
+
+def test_tags_follow_resource_writes(db_service, session, make_resource):
+    resource = make_resource(skills=json.dumps(['Schweißen', 'Kran', 'Kran']), equipment=json.dumps(['Bagger']))
+    assert tags_of(session, resource.id) == {('skill', 'Schweißen'), ('skill', 'Kran'), ('equipment', 'Bagger')}
+
+    db_service.update_resource(session, resource.id, {'skills': json.dumps(['Elektro']), 'equipment': None})
+    assert tags_of(session, resource.id) == {('skill', 'Elektro')}
+
+    db_service.delete_resource(session, resource.id)
+    assert tags_of(session, resource.id) == set()
+
+
+def test_skills_match_all_and_equipment_any(db_service, session, make_resource):
+    welder = make_resource(skills=json.dumps(['Schweißen']), equipment=json.dumps(['Bagger']))
+    crane_welder = make_resource(skills=json.dumps(['Schweißen', 'Kran']), equipment=json.dumps(['Kran LTM']))
+    make_resource(skills=json.dumps(['Kran']))
+
+    def matching(**filters):
+        return sorted(resource.id for resource in db_service.list_resources(session, filters))
+
+    assert matching(skills=['Schweißen']) == [welder.id, crane_welder.id]
+    assert matching(skills=['Schweißen', 'Kran']) == [crane_welder.id]
+    assert matching(skills=['Schweißen', 'Maurer']) == []
+    assert matching(equipment=['Bagger', 'Kran LTM']) == [welder.id, crane_welder.id]
+    assert matching(skills=['Kran'], equipment=['Bagger']) == []
+
+
+def test_coverage_matches_all_and_any():
+    index = TagBitsetIndex()
+    index.upsert(1, [('skill', 'Schweißen'), ('skill', 'Kran')])
+    index.upsert(2, [('skill', 'Schweißen')])
+    # Enough tags to spill into a second bitset word
+    index.upsert(3, [('skill', f'Skill {number}') for number in range(70)] + [('skill', 'Kran')])
+    index.upsert(4, [])
+    resource_ids = [1, 2, 3, 4, 5]
+
+    coverage = index.coverage(resource_ids, [('skill', 'Schweißen'), ('skill', 'Kran')])
+    np.testing.assert_allclose(coverage, [1, 0.5, 0.5, 0, 0])
+    assert [resource_ids[row] for row in np.flatnonzero(coverage == 1)] == [1]
+    assert [resource_ids[row] for row in np.flatnonzero(coverage > 0)] == [1, 2, 3]
+
+    # Keys no resource was ever tagged with count as missing
+    coverage = index.coverage(resource_ids, [('skill', 'Skill 69'), ('skill', 'Maurer')])
+    np.testing.assert_allclose(coverage, [0, 0, 0.5, 0, 0])
+    np.testing.assert_allclose(index.coverage(resource_ids, []), [1, 1, 1, 1, 1])
+
+    index.remove(1)
+    index.upsert(6, [('skill', 'Kran')])
+    np.testing.assert_allclose(index.coverage([1, 6], [('skill', 'Kran')]), [0, 1])
+
+
+def test_stale_resources_are_reindexed_at_their_version():
+    index = TagBitsetIndex()
+    index.upsert(1, [('skill', 'Kran')], 'v1')
+    index.upsert(2, [('skill', 'Kran')], 'v1')
+
+    assert index.stale({1: 'v1', 2: 'v2', 3: 'v1'}) == [2, 3]
+
+
+def test_matching_reloads_tags_written_by_other_workers(db_service, session, make_resource):
+    resource = make_resource(skills=json.dumps(['Kran']))
+    request = ResourceRequest(
+        trade_id=1, requested_by=1, category='Bau', required_person_count=1,
+        required_start_date=date(2024, 1, 10), required_end_date=date(2024, 1, 12),
+        required_skills=json.dumps(['Schweißen'])
+    )
+    assert db_service.match_resources_for_request(session, request)[0].match_score < 1
+
+    other_worker = type(db_service)(str(db_service.engine.url))
+    other_session = other_worker.get_session()
+    try:
+        other_worker.update_resource(other_session, resource.id, {'skills': json.dumps(['Schweißen'])})
+    finally:
+        other_session.close()
+        other_worker.replicas.stop()
+        other_worker.engine.dispose()
+    session.expire_all()
+
+    assert db_service.tag_bitsets.stale({resource.id: session.get(type(resource), resource.id).updated_at})
+    assert db_service.match_resources_for_request(session, request)[0].match_score == 1
@@ -0,0 +1,112 @@
+"""
+Resource statistics against the stored rows, and their cache
+"""
+
+from datetime import date, timedelta
+import random
+
+import pytest
+
+from backend.services import cache as cache_module
+from backend.services.resource_db_service import BOOKED_ALLOCATION_STATUSES
+
+
+def expected_statistics(resources, allocations, provider_id=None):
+    resources = [r for r in resources if provider_id is None or r.service_provider_id == provider_id]
+    resource_ids = {resource.id for resource in resources}
+    allocations = [a for a in allocations if a.resource_id in resource_ids]
+
+    available = sum(r.person_count * ((r.end_date - r.start_date).days + 1) for r in resources)
+    allocated = sum(
+        a.allocated_person_count * ((a.allocated_end_date - a.allocated_start_date).days + 1)
+        for a in allocations if a.allocation_status in BOOKED_ALLOCATION_STATUSES
+    )
+    return {
+        'total_resources': len(resources),
+        'active_resources': sum(r.status in ('available', 'allocated') for r in resources),
+        'average_utilization': round(allocated / available * 100, 2) if available else 0.0,
+        'total_revenue': float(sum(a.total_cost for a in allocations if a.allocation_status == 'completed')),
+    }
+
+
+def test_statistics_match_the_stored_rows(db_service, session, make_resource, make_allocation):
+    rng = random.Random(14)
+    resources, allocations = [], []
+    for _ in range(12):
+        start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 20))
+        resources.append(make_resource(
+            provider_id=rng.choice([1, 2]),
+            start_date=start, end_date=start + timedelta(days=rng.randint(5, 20)),
+            person_count=rng.randint(2, 5),
+            status=rng.choice(['available', 'allocated', 'unavailable'])
+        ))
+    for resource in resources:
+        for _ in range(rng.randint(0, 2)):
+            first = resource.start_date + timedelta(days=rng.randint(0, 4))
+            allocation = make_allocation(
+                resource, allocated_start_date=first, allocated_end_date=first + timedelta(days=rng.randint(0, 3)),
+                total_cost=rng.randint(1, 9) * 100
+            )
+            db_service.update_allocation_status(
+                session, allocation.id, rng.choice(['accepted', 'completed', 'rejected', 'offer_submitted'])
+            )
+            allocations.append(allocation)
+    session.expire_all()
+
+    for provider_id in (None, 1, 2, 3):
+        statistics = db_service.get_resource_statistics(session, provider_id)
+        expected = expected_statistics(resources, allocations, provider_id)
+        assert statistics == pytest.approx(expected), provider_id
+
+
+@pytest.fixture
+def query_count(db_service, monkeypatch):
+    """Number of statistics queries per provider filter"""
+    counts = {}
+    query = db_service._query_resource_statistics
+
+    def counted(session, provider_id):
+        counts[provider_id] = counts.get(provider_id, 0) + 1
+        return query(session, provider_id)
+    monkeypatch.setattr(db_service, '_query_resource_statistics', counted)
+    return counts
+
+
+def test_statistics_are_cached_per_provider_until_the_ttl(db_service, session, make_resource, query_count, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    make_resource()
+    make_resource(provider_id=2)
+
+    for _ in range(3):
+        assert db_service.get_resource_statistics(session, 1)['total_resources'] == 1
+        assert db_service.get_resource_statistics(session)['total_resources'] == 2
+    assert query_count == {1: 1, None: 1}
+
+    now[0] += 10
+    db_service.get_resource_statistics(session, 1)
+    assert query_count == {1: 2, None: 1}
+
+
+def test_writes_drop_the_cached_statistics_they_change(db_service, session, make_resource, make_allocation, query_count):
+    resource = make_resource(person_count=2)
+    other = make_resource(provider_id=2)
+
+    def statistics():
+        return {provider_id: db_service.get_resource_statistics(session, provider_id) for provider_id in (None, 1, 2)}
+
+    cached = statistics()
+    allocation = make_allocation(resource, allocated_person_count=2, allocation_status='accepted', total_cost=300)
+    after_allocation = statistics()
+    assert after_allocation[1]['average_utilization'] == 100.0
+    assert after_allocation[None] != cached[None]
+    # Provider 2 was not touched and is still served from the cache
+    assert query_count == {None: 2, 1: 2, 2: 1}
+
+    db_service.update_allocation_status(session, allocation.id, 'completed')
+    assert statistics()[1]['total_revenue'] == 300.0
+    db_service.update_resource(session, other.id, {'status': 'unavailable'})
+    assert statistics()[2]['active_resources'] == 0
+    db_service.delete_resource(session, other.id)
+    assert statistics()[2]['total_resources'] == 0
+    assert statistics()[None]['total_resources'] == 1